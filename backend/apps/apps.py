@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AppsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'backend.apps'
+
+    def ready(self):
+        from . import checks, metrics, signals  # noqa: F401
@@ -0,0 +1,270 @@
+"""
+Асинхронные версии читающих view (ASGI, async ORM Django).
+
+Ответы совпадают с синхронными версиями из views.py, включая тексты ошибок.
+DRF не поддерживает async view, поэтому это обычные Django view: они не проходят
+аутентификацию DRF, пользователь загружается через aload_caller.
+Какие версии обслуживают URL, задает настройка ASYNC_VIEWS (см. urls.py).
+"""
+import functools
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+from . import views
+from .cache import MISSING
+from .changes import change_notifier, change_params, changes_data, changes_query, settled_rows
+from .metrics import timed_render
+from .models import Bid, Tender
+from .pagination import KEYSET_ORDERING, InvalidCursor, akeyset_page
+from .permissions import aload_caller
+from .renderers import render_json
+from .services import tender_feed_cache, tender_feed_etag, tender_feed_key
+from .views import (
+    bid_reader, json_response, review_access_error, review_access_query, review_embeds, review_reader,
+    reviews_query, tender_feed_params, tender_feed_queryset, tender_reader, visible_bids,
+)
+
+
+def get_only(view):
+    """
+    Аналог @api_view(["GET"]) для async view: HEAD - как GET, OPTIONS - метаданные DRF
+    от синхронной версии view с тем же именем, остальные методы -> 405 с тем же телом, что у DRF.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method == 'OPTIONS':
+            return await sync_to_async(getattr(views, view.__name__))(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD'):
+            response = json_response({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            response['Allow'] = 'GET, HEAD, OPTIONS'
+            return response
+        return await view(request, *args, **kwargs)
+
+    # csrf_exempt() в Django 4.2 делает из async view синхронную
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+def reason(text, status):
+    return json_response({'reason': text}, status=status)
+
+
+async def values(queryset):
+    return [row async for row in queryset]
+
+
+async def page_response(reader, queryset, cursor, limit, offset):
+    """
+    Страница списка: по курсору ({"items", "nextCursor"}) или по limit/offset.
+    """
+    if cursor is not None:
+        try:
+            page, next_cursor = await akeyset_page(reader.values(queryset), cursor, limit)
+        except InvalidCursor:
+            return reason("Invalid cursor.", 400)
+        return json_response({"items": reader.read(page), "nextCursor": next_cursor}, status=200)
+
+    rows = await values(reader.values(queryset.order_by(*KEYSET_ORDERING)[offset:offset + limit]))
+    return json_response(reader.read(rows), status=200)
+
+
+def pagination(request):
+    """
+    (limit, offset) из параметров запроса; ValueError, если это не целые числа.
+    """
+    return int(request.GET.get('limit', 5)), int(request.GET.get('offset', 0))
+
+
+@get_only
+async def ping(request):
+    """
+    Проверка доступности сервера.
+    """
+    return json_response("ok", status=200)
+
+
+@get_only
+async def get_tenders(request):
+    """
+    Async-версия views.get_tenders.
+    """
+    params, error = tender_feed_params(request)
+    if error:
+        return reason(error, 400)
+
+    key = tender_feed_key(params)
+    cached = MISSING
+    if settings.TENDER_FEED_CACHE:
+        generation = await tender_feed_cache.ageneration()
+        etag = tender_feed_etag(key, generation)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+        cached = await tender_feed_cache.aget(key, generation)
+
+    if cached is MISSING:
+        tenders = tender_feed_queryset(params)
+        if params['cursor'] is not None:
+            try:
+                page, next_cursor = await akeyset_page(tender_reader.values(tenders), params['cursor'], params['limit'])
+            except InvalidCursor:
+                return reason('Invalid cursor', 400)
+            data = {'items': tender_reader.read(page), 'nextCursor': next_cursor}
+        else:
+            offset, limit = params['offset'], params['limit']
+            data = tender_reader.read(await values(
+                tender_reader.values(tenders.order_by(*KEYSET_ORDERING)[offset:offset + limit])
+            ))
+
+        # Last-Modified - время последнего изменения тендеров (без кэша ленты не отдается)
+        last_modified = http_date(await tender_feed_cache.achanged_at()) if settings.TENDER_FEED_CACHE else None
+        with timed_render():
+            cached = (render_json(data), last_modified)
+        if settings.TENDER_FEED_CACHE:
+            await tender_feed_cache.aset(key, cached, generation)
+
+    body, last_modified = cached
+    response = HttpResponse(body, content_type='application/json', status=200)
+    if settings.TENDER_FEED_CACHE:
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+    return response
+
+
+@get_only
+async def get_user_tenders(request):
+    """
+    Async-версия views.get_user_tenders.
+    """
+    username = request.GET.get('username')
+    if not username:
+        return reason("Username is required.", 400)
+
+    caller = await aload_caller(username)
+    if caller.employee is None:
+        return reason("User with the specified username does not exist.", 401)
+
+    try:
+        limit, offset = pagination(request)
+    except ValueError:
+        return reason("Limit and offset must be integers.", 400)
+
+    tenders = Tender.objects.filter(creator_username=username)
+    return await page_response(tender_reader, tenders, request.GET.get('cursor'), limit, offset)
+
+
+@get_only
+async def get_user_bids(request):
+    """
+    Async-версия views.get_user_bids.
+    """
+    username = request.GET.get('username')
+    if not username:
+        return reason("Username is required.", 400)
+
+    caller = await aload_caller(username)
+    if caller.employee is None:
+        return reason("User with the specified username does not exist.", 401)
+
+    bids = await values(bid_reader.values(Bid.objects.filter(creator_username=username)))
+    return json_response(bid_reader.read(bids), status=200)
+
+
+@get_only
+async def get_bids_for_tender(request, tender_id):
+    """
+    Async-версия views.get_bids_for_tender.
+    """
+    username = request.GET.get('username')
+    try:
+        limit, offset = pagination(request)
+    except ValueError:
+        return reason("Limit and offset must be integers.", 400)
+
+    if username:
+        caller = await aload_caller(username)
+        if caller.employee is None:
+            return reason("User with the specified username does not exist.", 401)
+
+    bids = visible_bids(tender_id, username)
+
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        try:
+            page, next_cursor = await akeyset_page(bid_reader.values(bids), cursor, limit)
+        except InvalidCursor:
+            return reason("Invalid cursor.", 400)
+        data = {"items": bid_reader.read(page), "nextCursor": next_cursor}
+    else:
+        page = await values(bid_reader.values(bids.order_by(*KEYSET_ORDERING)[offset:offset + limit]))
+        data = bid_reader.read(page)
+
+    if not page and not await Tender.objects.filter(id=tender_id).aexists():
+        return json_response({"detail": "No Tender matches the given query."}, status=404)
+
+    return json_response(data, status=200)
+
+
+@get_only
+async def get_reviews(request, tender_id):
+    """
+    Async-версия views.get_reviews.
+    """
+    author_username = request.GET.get('authorUsername')
+    request_username = request.GET.get('requestUsername')
+
+    try:
+        limit, offset = pagination(request)
+    except ValueError:
+        return reason("Limit and offset must be integers.", 400)
+
+    if not author_username or not request_username:
+        return reason("username are required.", 400)
+
+    embeds, error = review_embeds(request)
+    if error:
+        return reason(error, 400)
+
+    caller = await aload_caller(request_username)
+    error = review_access_error(await review_access_query(tender_id, author_username).afirst(), caller)
+    if error:
+        return json_response(*error)
+
+    reader = review_reader.extend(embeds)
+    reviews = reviews_query(tender_id, author_username, reader)
+
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        try:
+            page, next_cursor = await akeyset_page(reviews, cursor, limit)
+        except InvalidCursor:
+            return reason("Invalid cursor.", 400)
+        return json_response({"items": reader.read(page), "nextCursor": next_cursor}, status=200)
+
+    return json_response(reader.read(await values(reviews[offset:offset + limit])), status=200)
+
+
+@get_only
+async def get_changes(request):
+    """
+    Async-версия views.get_changes: ожидание новых событий не занимает поток,
+    при CHANGES_LISTEN запрос будится по NOTIFY, а не опросом.
+    """
+    params, error = change_params(request)
+    if error:
+        return reason(error, 400)
+
+    since, limit, wait = params
+    deadline = time.monotonic() + wait
+    while True:
+        generation = change_notifier.generation
+        rows = settled_rows(since, await values(changes_query(since, limit)))
+        remaining = deadline - time.monotonic()
+        if rows or remaining <= 0:
+            return json_response(changes_data(since, rows), status=200)
+        await change_notifier.wait(generation, remaining)
@@ -0,0 +1,156 @@
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Bid, Employee, Organization, Tender
+from .serializers import BidFieldsSerializer, TenderFieldsSerializer
+
+
+def failure(index, code, reason):
+    return {'index': index, 'status': code, 'reason': reason}
+
+
+def parse_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_creators(usernames):
+    """
+    username -> множество id организаций, за которые он ответственен.
+    Один запрос (LEFT JOIN organization_responsible); несуществующих пользователей нет в словаре.
+    """
+    creators = {}
+    rows = Employee.objects.filter(username__in=usernames).values_list(
+        'username', 'organizationresponsible__organization_id'
+    )
+    for username, organization_id in rows:
+        organizations = creators.setdefault(username, set())
+        if organization_id is not None:
+            organizations.add(organization_id)
+    return creators
+
+
+def existing_organizations(organization_ids):
+    return set(Organization.objects.filter(id__in=organization_ids).values_list('id', flat=True))
+
+
+def create_tenders(items):
+    """
+    Массовое создание тендеров. Проверки те же, что в create_tender, но по одному
+    IN-запросу на таблицу для всей пачки; корректные тендеры вставляются bulk_create.
+    Возвращает (созданные тендеры, ошибки по индексам).
+    """
+    usernames = {item.get('creatorUsername') for item in items if isinstance(item.get('creatorUsername'), str)}
+    organization_ids = {parse_uuid(item.get('organizationId')) for item in items} - {None}
+    creators = load_creators(usernames)
+    organizations = existing_organizations(organization_ids)
+
+    now = timezone.now()
+    tenders, indexes, errors = [], [], []
+    for index, item in enumerate(items):
+        username = item.get('creatorUsername')
+        organization_id = parse_uuid(item.get('organizationId'))
+        if not isinstance(username, str) or not username or not item.get('organizationId'):
+            errors.append(failure(index, 400, "Missing required fields: 'creatorUsername' and/or 'organizationId'."))
+            continue
+        if username not in creators:
+            errors.append(failure(index, 401, "Creator with the specified username does not exist."))
+            continue
+        if organization_id not in organizations:
+            errors.append(failure(index, 400, "Organization with the specified ID does not exist."))
+            continue
+        if organization_id not in creators[username]:
+            errors.append(failure(index, 403, "Creator is not responsible for the organization."))
+            continue
+
+        serializer = TenderFieldsSerializer(data={
+            'name': item.get('name'),
+            'description': item.get('description'),
+            'service_type': item.get('serviceType', item.get('service_type')),
+            'version': item.get('version', 1),
+        })
+        if not serializer.is_valid():
+            errors.append({'index': index, 'status': 400, 'errors': serializer.errors})
+            continue
+
+        tenders.append(Tender(
+            **serializer.validated_data,
+            status='CREATED',
+            organization_id=organization_id,
+            creator_username_id=username,
+            created_at=now,
+        ))
+        indexes.append(index)
+
+    with transaction.atomic():
+        Tender.objects.bulk_create(tenders, batch_size=settings.BULK_BATCH_SIZE)
+    return list(zip(indexes, tenders)), errors
+
+
+def create_bids(items):
+    """
+    Массовое создание предложений. Проверки те же, что в create_bid, но по одному
+    IN-запросу на таблицу для всей пачки; корректные предложения вставляются bulk_create.
+    Возвращает (созданные предложения, ошибки по индексам).
+    """
+    usernames = {item.get('creatorUsername') for item in items if isinstance(item.get('creatorUsername'), str)}
+    organization_ids = {parse_uuid(item.get('organizationId')) for item in items} - {None}
+    tender_ids = {parse_int(item.get('tenderId')) for item in items} - {None}
+    creators = load_creators(usernames)
+    organizations = existing_organizations(organization_ids)
+    tenders = dict(Tender.objects.filter(id__in=tender_ids).values_list('id', 'organization_id'))
+
+    now = timezone.now()
+    bids, indexes, errors = [], [], []
+    for index, item in enumerate(items):
+        username = item.get('creatorUsername')
+        tender_id = parse_int(item.get('tenderId'))
+        organization_id = parse_uuid(item.get('organizationId'))
+        if not isinstance(username, str) or not all([item.get('name'), item.get('tenderId'), item.get('organizationId'), username]):
+            errors.append(failure(index, 400, "Missing required fields: 'name', 'tenderId', 'organizationId', and/or 'creatorUsername'."))
+            continue
+        if username not in creators:
+            errors.append(failure(index, 400, "Creator with the specified username does not exist."))
+            continue
+        if tender_id not in tenders:
+            errors.append(failure(index, 400, "Tender with the specified ID does not exist."))
+            continue
+        if organization_id not in organizations:
+            errors.append(failure(index, 400, "Organization with the specified ID does not exist."))
+            continue
+        if tenders[tender_id] in creators[username]:
+            errors.append(failure(index, 403, "Creator cannot make bids for the organization related to the tender."))
+            continue
+
+        serializer = BidFieldsSerializer(data={'name': item.get('name'), 'description': item.get('description')})
+        if not serializer.is_valid():
+            errors.append({'index': index, 'status': 400, 'errors': serializer.errors})
+            continue
+
+        bids.append(Bid(
+            **serializer.validated_data,
+            status='CREATED',
+            tender_id=tender_id,
+            organization_id=organization_id,
+            creator_username_id=username,
+            created_at=now,
+            version=1,
+            votes_for=0,
+        ))
+        indexes.append(index)
+
+    with transaction.atomic():
+        Bid.objects.bulk_create(bids, batch_size=settings.BULK_BATCH_SIZE)
+    return list(zip(indexes, bids)), errors
@@ -0,0 +1,184 @@
+import threading
+import time
+
+from cachetools import TTLCache
+from django.core.cache import caches
+
+
+MISSING = object()
+
+# Все двухуровневые кэши процесса, для вывода счетчиков
+REGISTRY = {}
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш: локальный TTL/LRU-кэш процесса перед общим кэшем Django (CACHES).
+
+    Ключи версионируются общим счетчиком поколений: invalidate() увеличивает его,
+    и все старые записи перестают находиться. Локальный уровень (вместе с номером
+    поколения) живет local_ttl секунд, поэтому другие процессы видят сброс не позже чем через local_ttl.
+
+    Значение, вычисленное по данным поколения g, нужно записывать с generation=g (прочитанным
+    до чтения данных): если поколение успело смениться, запись пропускается, и устаревшее
+    значение не попадает под ключ нового поколения.
+
+    changed_at() - время последнего сброса (или появления счетчика поколений): время
+    изменения данных, по которым считаются значения, например для Last-Modified.
+    """
+
+    def __init__(self, prefix, ttl, local_ttl, local_maxsize, alias='default'):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.alias = alias
+        self._local = TTLCache(maxsize=local_maxsize, ttl=local_ttl) if local_ttl > 0 else None
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        REGISTRY[prefix] = self
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _generation_key(self):
+        return f'{self.prefix}:generation'
+
+    def _changed_at_key(self):
+        return f'{self.prefix}:changed-at'
+
+    def generation(self):
+        local_value = self._local_get(self._generation_key())
+        if local_value is not MISSING:
+            return local_value
+
+        key = self._generation_key()
+        value = self.shared.get(key)
+        if value is None:
+            # Начальное значение от времени: после очистки общего кэша номера не повторяются
+            self.shared.add(self._changed_at_key(), time.time(), timeout=None)
+            self.shared.add(key, int(time.time() * 1000), timeout=None)
+            value = self.shared.get(key)
+        self._local_set(key, value)
+        return value
+
+    async def ageneration(self):
+        """
+        generation() для async views: общий кэш - через async API кэшей Django.
+        """
+        key = self._generation_key()
+        local_value = self._local_get(key)
+        if local_value is not MISSING:
+            return local_value
+
+        value = await self.shared.aget(key)
+        if value is None:
+            await self.shared.aadd(self._changed_at_key(), time.time(), timeout=None)
+            await self.shared.aadd(key, int(time.time() * 1000), timeout=None)
+            value = await self.shared.aget(key)
+        self._local_set(key, value)
+        return value
+
+    def changed_at(self):
+        """
+        Время последнего сброса (epoch-секунды) или None, если оно вытеснено из общего кэша.
+        """
+        return self.shared.get(self._changed_at_key())
+
+    async def achanged_at(self):
+        return await self.shared.aget(self._changed_at_key())
+
+    def _key(self, key, generation):
+        return f'{self.prefix}:{generation}:{key}'
+
+    def get(self, key, generation=None):
+        full_key = self._key(key, self.generation() if generation is None else generation)
+
+        value = self._local_get(full_key)
+        if value is not MISSING:
+            self.local_hits += 1
+            return value
+
+        value = self.shared.get(full_key, MISSING)
+        if value is not MISSING:
+            self.shared_hits += 1
+            self._local_set(full_key, value)
+            return value
+
+        self.misses += 1
+        return MISSING
+
+    def set(self, key, value, generation=None):
+        """
+        Записать значение; с generation - только если общее поколение не изменилось.
+        Возвращает False, если запись пропущена.
+        """
+        if generation is None:
+            generation = self.generation()
+        elif self.shared.get(self._generation_key()) != generation:
+            return False
+        full_key = self._key(key, generation)
+        self.shared.set(full_key, value, timeout=self.ttl)
+        self._local_set(full_key, value)
+        return True
+
+    async def aget(self, key, generation=None):
+        full_key = self._key(key, await self.ageneration() if generation is None else generation)
+
+        value = self._local_get(full_key)
+        if value is not MISSING:
+            self.local_hits += 1
+            return value
+
+        value = await self.shared.aget(full_key, MISSING)
+        if value is not MISSING:
+            self.shared_hits += 1
+            self._local_set(full_key, value)
+            return value
+
+        self.misses += 1
+        return MISSING
+
+    async def aset(self, key, value, generation=None):
+        if generation is None:
+            generation = await self.ageneration()
+        elif await self.shared.aget(self._generation_key()) != generation:
+            return False
+        full_key = self._key(key, generation)
+        await self.shared.aset(full_key, value, timeout=self.ttl)
+        self._local_set(full_key, value)
+        return True
+
+    def invalidate(self):
+        # Время - до смены поколения: кто увидит новое поколение, увидит и это время
+        self.shared.set(self._changed_at_key(), time.time(), timeout=None)
+        key = self._generation_key()
+        try:
+            self.shared.incr(key)
+        except ValueError:
+            self.shared.add(key, int(time.time() * 1000), timeout=None)
+        self.clear_local()
+
+    def clear_local(self):
+        if self._local is not None:
+            with self._lock:
+                self._local.clear()
+
+    def stats(self):
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+        }
+
+    def _local_get(self, key):
+        if self._local is None:
+            return MISSING
+        with self._lock:
+            return self._local.get(key, MISSING)
+
+    def _local_set(self, key, value):
+        if self._local is not None:
+            with self._lock:
+                self._local[key] = value
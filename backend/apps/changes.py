@@ -0,0 +1,221 @@
+"""
+Лента изменений тендеров и предложений (outbox) для инкрементальных потребителей.
+
+Изменение статуса, правка, откат и решение по предложению пишут события в change_event
+в своей транзакции, последним запросом перед фиксацией (record_changes). Номера событий
+выдает sequence change_event_seq без блокировок, поэтому транзакции фиксируются в
+произвольном порядке: событие с меньшим номером может стать видимым позже большего, а
+номера откаченных транзакций остаются пропусками. Чтение отдает события только до первого
+пропуска (settled_rows): пропуск считается окончательным, когда следующее за ним событие
+записано больше CHANGES_GAP_TIMEOUT назад - номер выдан раньше, а от record_changes до
+COMMIT проходит один запрос. Так потребитель, читающий seq > since, не пропустит событие,
+зафиксированное позже; после отката события следом ждут до CHANGES_GAP_TIMEOUT.
+После фиксации PostgreSQL рассылает NOTIFY changes с последним номером (ChangeNotifier).
+"""
+import asyncio
+import logging
+import select
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Now
+
+from .models import ChangeEvent
+from .readers import RowReader
+from .serializers import ChangeEventSerializer
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'changes'
+
+# Виды событий
+STATUS = 'status'
+EDITED = 'edited'
+ROLLED_BACK = 'rolled_back'
+VOTED = 'voted'
+
+# created_at - время записи события (clock_timestamp), а не начала транзакции: по нему settled_rows
+# определяет возраст пропуска
+RECORD_CHANGES = f'''
+WITH inserted AS (
+    INSERT INTO change_event (entity, entity_id, event, status, version, created_at)
+    SELECT e.entity, e.entity_id, e.event, e.status, e.version, clock_timestamp()
+    FROM unnest(%(entities)s::text[], %(ids)s::bigint[], %(events)s::text[],
+                %(statuses)s::text[], %(versions)s::integer[])
+        WITH ORDINALITY AS e(entity, entity_id, event, status, version, n)
+    ORDER BY e.n
+    RETURNING seq
+)
+SELECT pg_notify('{CHANNEL}', max(seq)::text) FROM inserted
+'''
+
+change_reader = RowReader(ChangeEventSerializer)
+
+
+def tender_change(tender, event):
+    return ('tender', tender.id, event, tender.status, tender.version)
+
+
+def bid_change(bid, event):
+    return ('bid', bid.id, event, bid.status, bid.version)
+
+
+def record_changes(changes):
+    """
+    Записать события (entity, id, event, status, version) одним запросом.
+    Вызывается внутри транзакции изменения последним запросом перед фиксацией.
+    """
+    if not changes:
+        return
+    entities, ids, events, statuses, versions = (list(column) for column in zip(*changes))
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_CHANGES, {
+            'entities': entities,
+            'ids': ids,
+            'events': events,
+            'statuses': statuses,
+            'versions': versions,
+        })
+
+
+def change_params(request):
+    """
+    (since, limit, wait) из параметров запроса и текст ошибки или None.
+    """
+    try:
+        since = int(request.GET.get('since', 0))
+        limit = int(request.GET.get('limit', 100))
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return None, "Since, limit and wait must be numbers."
+    if since < 0 or not 0 < limit <= settings.CHANGES_MAX_LIMIT or not 0 <= wait <= settings.CHANGES_MAX_WAIT:
+        return None, (
+            f"Invalid parameters: since >= 0, 0 < limit <= {settings.CHANGES_MAX_LIMIT}, "
+            f"0 <= wait <= {settings.CHANGES_MAX_WAIT}."
+        )
+    return (since, limit, wait), None
+
+
+def changes_query(since, limit):
+    """
+    События после since с признаком settled: записаны больше CHANGES_GAP_TIMEOUT назад (по часам БД).
+    """
+    settled = ExpressionWrapper(
+        Q(created_at__lt=Now() - timedelta(seconds=settings.CHANGES_GAP_TIMEOUT)), output_field=BooleanField(),
+    )
+    events = ChangeEvent.objects.filter(seq__gt=since).annotate(settled=settled).order_by('seq')[:limit]
+    return events.values(*change_reader.columns, 'settled')
+
+
+def settled_rows(since, rows):
+    """
+    Начало rows (по возрастанию seq) до первого пропуска номера, за которым событие еще
+    не settled: пропущенный номер может принадлежать незафиксированной транзакции.
+    """
+    expected = since + 1
+    for index, row in enumerate(rows):
+        if row['seq'] != expected and not row['settled']:
+            return rows[:index]
+        expected = row['seq'] + 1
+    return rows
+
+
+def changes_data(since, rows):
+    """
+    Ответ ленты: события и since для следующего запроса.
+    """
+    return {"items": change_reader.read(rows), "nextSince": rows[-1]['seq'] if rows else since}
+
+
+class ChangeNotifier:
+    """
+    LISTEN changes на отдельном соединении в фоновом потоке процесса: будит ждущие
+    async long-poll запросы, как только зафиксировано новое событие, без опроса БД.
+    Без CHANGES_LISTEN или при обрыве соединения ожидание сводится к опросу
+    раз в CHANGES_POLL_INTERVAL.
+    """
+
+    def __init__(self):
+        # Растет с каждым уведомлением (и переподключением): ждущий сравнивает его с прочитанным до запроса
+        self.generation = 0
+        self.listening = False
+        self.waiters = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='change-notifier', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                self.listen()
+            except Exception:
+                logger.exception('LISTEN %s failed, reconnecting', CHANNEL)
+            self.listening = False
+            time.sleep(settings.CHANGES_POLL_INTERVAL)
+
+    def listen(self):
+        import psycopg2
+
+        listener = psycopg2.connect(**connections['default'].get_connection_params())
+        try:
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            self.listening = True
+            # Пока соединения не было, уведомления терялись
+            self.wake()
+            while True:
+                if select.select([listener], [], [], 60) == ([], [], []):
+                    continue
+                listener.poll()
+                if listener.notifies:
+                    listener.notifies.clear()
+                    self.wake()
+        finally:
+            listener.close()
+
+    def wake(self):
+        with self.lock:
+            self.generation += 1
+            waiters = list(self.waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, generation, timeout):
+        """
+        Ждать уведомления после generation (значение до чтения событий) не дольше timeout;
+        после возврата события нужно перечитать.
+        """
+        if not settings.CHANGES_LISTEN or connection.vendor != 'postgresql':
+            await asyncio.sleep(min(timeout, settings.CHANGES_POLL_INTERVAL))
+            return
+
+        self.start()
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.lock:
+            self.waiters.add(waiter)
+        try:
+            if self.generation != generation:
+                return
+            # Без соединения LISTEN - опрос с обычным интервалом
+            limit = timeout if self.listening else min(timeout, settings.CHANGES_POLL_INTERVAL)
+            try:
+                await asyncio.wait_for(waiter[1].wait(), limit)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            with self.lock:
+                self.waiters.discard(waiter)
+
+
+change_notifier = ChangeNotifier()
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.db import DatabaseError, connections
+
+from .indexes import missing_indexes
+
+
+@register(Tags.database)
+def check_indexes(app_configs, databases=None, **kwargs):
+    """
+    Отчет о недостающих индексах: manage.py check --database default
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            continue
+        try:
+            missing = missing_indexes(connection)
+        except DatabaseError as exc:
+            errors.append(Warning(f'Could not inspect indexes: {exc}', id='apps.W002'))
+            continue
+        for index in missing:
+            description = index.get('name') or '({})'.format(', '.join(index['columns']))
+            if index.get('unique'):
+                description = f'UNIQUE {description}'
+            errors.append(Warning(
+                f"Missing index on {index['table']} {description} in database '{alias}'.",
+                hint='Run manage.py migrate apps.',
+                id='apps.W001',
+            ))
+    return errors
+
+
+@register(Tags.caches, deploy=True)
+def check_tender_feed_cache(app_configs, **kwargs):
+    """
+    Кэш ленты тендеров при нескольких воркерах требует общего бэкенда кэша.
+    Выполняется в manage.py check --deploy и перед запуском serve.py.
+    """
+    backend = settings.CACHES[settings.TENDER_FEED_CACHE_ALIAS]['BACKEND']
+    if settings.TENDER_FEED_CACHE and settings.WEB_CONCURRENCY > 1 and backend in settings.PROCESS_LOCAL_CACHE_BACKENDS:
+        return [Error(
+            f'TENDER_FEED_CACHE with {settings.WEB_CONCURRENCY} workers uses the process-local {backend}: '
+            'workers will serve stale tender feeds and 304 responses.',
+            hint='Set CACHE_BACKEND to a shared backend (Redis, Memcached) or TENDER_FEED_CACHE=false.',
+            id='apps.E001',
+        )]
+    return []
@@ -0,0 +1,73 @@
+# Индексы, на которые рассчитывают запросы во views.py (создаются миграциями apps).
+# columns - ведущие столбцы индекса; подойдет любой непартиционный индекс с таким префиксом.
+# Частичные и выражения-индексы проверяются по имени.
+REQUIRED_INDEXES = [
+    {'table': 'tender', 'columns': ['status', 'created_at', 'id']},
+    {'table': 'tender', 'columns': ['creator_username']},
+    {'table': 'tender', 'columns': ['status', 'service_type']},
+    {'table': 'tender', 'name': 'tender_published_service_type_name_idx'},
+    {'table': 'tender', 'name': 'tender_published_service_type_trgm_idx'},
+    {'table': 'tender', 'name': 'tender_changed_at_idx'},
+    {'table': 'bid', 'columns': ['tender_id', 'created_at', 'id']},
+    {'table': 'bid', 'columns': ['tender_id', 'status']},
+    {'table': 'bid', 'columns': ['creator_username']},
+    {'table': 'bid', 'name': 'bid_changed_at_idx'},
+    {'table': 'tender_version', 'columns': ['tender_id', 'version'], 'unique': True},
+    {'table': 'bid_version', 'columns': ['bid_id', 'version'], 'unique': True},
+    {'table': 'review', 'columns': ['bid_id', 'created_at', 'id']},
+    {'table': 'organization_responsible', 'columns': ['user_id', 'organization_id']},
+    {'table': 'bid_voters', 'columns': ['bid_id', 'employee_id'], 'unique': True},
+]
+
+# Столбцы (NULL для выражений), уникальность, частичность и валидность каждого индекса таблиц
+INDEXES_SQL = """
+    SELECT t.relname, i.relname,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, n)
+               LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+               ORDER BY k.n
+           ),
+           ix.indisunique, ix.indpred IS NOT NULL, ix.indisvalid
+    FROM pg_index ix
+    JOIN pg_class t ON t.oid = ix.indrelid
+    JOIN pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_namespace ns ON ns.oid = t.relnamespace
+    WHERE ns.nspname = current_schema() AND t.relname = ANY(%s)
+"""
+
+
+def load_indexes(connection):
+    tables = sorted({index['table'] for index in REQUIRED_INDEXES})
+    with connection.cursor() as cursor:
+        cursor.execute(INDEXES_SQL, [tables])
+        return [
+            {'table': table, 'name': name, 'columns': columns, 'unique': unique, 'partial': partial}
+            for table, name, columns, unique, partial, valid in cursor.fetchall()
+            if valid
+        ]
+
+
+def is_satisfied(required, existing):
+    for index in existing:
+        if index['table'] != required['table']:
+            continue
+        if 'name' in required:
+            if index['name'] == required['name']:
+                return True
+            continue
+        columns = required['columns']
+        if index['partial'] or index['columns'][:len(columns)] != columns:
+            continue
+        if required.get('unique') and not (index['unique'] and len(index['columns']) == len(columns)):
+            continue
+        return True
+    return False
+
+
+def missing_indexes(connection):
+    """
+    Требуемые индексы, которых нет (или которые INVALID) в подключенной БД.
+    """
+    existing = load_indexes(connection)
+    return [required for required in REQUIRED_INDEXES if not is_satisfied(required, existing)]
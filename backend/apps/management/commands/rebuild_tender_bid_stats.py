@@ -0,0 +1,16 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.stats import rebuild_tender_bid_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute tender_bid_stats from the bid table and repair rows that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tender', type=int, help='rebuild the summary of one tender only')
+
+    def handle(self, *args, **options):
+        result = rebuild_tender_bid_stats(options['tender'])
+        self.stdout.write(json.dumps(result))
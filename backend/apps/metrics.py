@@ -0,0 +1,216 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+logger = logging.getLogger(__name__)
+
+# Границы гистограммы времени ответа, секунды
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Счетчики текущего запроса (contextvar работает и в потоках, и в корутинах)
+current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """
+    Число SQL-запросов, время в БД и время сериализации ответа одного запроса.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    execute_wrapper всех соединений: учитывает запрос в счетчиках текущего запроса.
+    Соединения у каждого потока свои, а contextvar доходит и до потоков sync_to_async
+    (async ORM), поэтому обертка ставится на соединение при создании, а не на запрос.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@contextmanager
+def timed_render():
+    """
+    Учесть время блока как время сериализации ответа текущего запроса.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = current.get()
+        if metrics is not None:
+            metrics.render += time.perf_counter() - started
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self.wall = 0.0
+        self.budget_exceeded = 0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    Накопленные счетчики по имени URL в текущем процессе.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, metrics, wall, exceeded):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = ViewStats()
+            stats.requests += 1
+            stats.queries += metrics.queries
+            stats.db += metrics.db
+            stats.render += metrics.render
+            stats.wall += wall
+            stats.budget_exceeded += exceeded
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if wall <= bound:
+                    stats.buckets[index] += 1
+
+    def render(self):
+        """
+        Счетчики в текстовом формате Prometheus.
+        """
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = [
+                '# HELP tenders_http_request_duration_seconds Request wall time by view.',
+                '# TYPE tenders_http_request_duration_seconds histogram',
+            ]
+            for view, stats in views:
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    lines.append(f'tenders_http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {count}')
+                lines.append(f'tenders_http_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {stats.requests}')
+                lines.append(f'tenders_http_request_duration_seconds_sum{{view="{view}"}} {stats.wall:.6f}')
+                lines.append(f'tenders_http_request_duration_seconds_count{{view="{view}"}} {stats.requests}')
+
+            counters = (
+                ('tenders_db_queries_total', 'SQL queries by view.', 'queries', '{}'),
+                ('tenders_db_duration_seconds_total', 'Time spent in the database by view.', 'db', '{:.6f}'),
+                ('tenders_render_duration_seconds_total', 'Time spent serializing responses by view.', 'render', '{:.6f}'),
+                ('tenders_query_budget_exceeded_total', 'Requests over the view query budget.', 'budget_exceeded', '{}'),
+            )
+            for name, help_text, attribute, value_format in counters:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for view, stats in views:
+                    lines.append(f'{name}{{view="{view}"}} {value_format.format(getattr(stats, attribute))}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+def server_timing(metrics, wall):
+    return (
+        f'db;dur={metrics.db * 1000:.2f};desc="{metrics.queries} queries", '
+        f'render;dur={metrics.render * 1000:.2f}, '
+        f'total;dur={wall * 1000:.2f}'
+    )
+
+
+class QueryMetricsMiddleware:
+    """
+    Считает SQL-запросы, время в БД, время сериализации и полное время запроса
+    по имени URL. Отдает их в заголовке Server-Timing и копит для /metrics.
+    Если число запросов превышает QUERY_BUDGETS[имя URL], пишет предупреждение
+    или (QUERY_BUDGET_MODE = 'raise', для тестов) бросает QueryBudgetExceeded.
+    Работает и в синхронной, и в асинхронной цепочке middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    def finish(self, request, response, metrics, wall):
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match is not None and match.url_name else 'unmatched'
+        budget = settings.QUERY_BUDGETS.get(view)
+        exceeded = settings.QUERY_BUDGET_MODE != 'off' and budget is not None and metrics.queries > budget
+
+        REGISTRY.observe(view, metrics, wall, exceeded)
+        response['Server-Timing'] = server_timing(metrics, wall)
+
+        if exceeded:
+            message = f'{view}: {metrics.queries} queries, budget {budget}'
+            if settings.QUERY_BUDGET_MODE == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning('Query budget exceeded: %s', message)
+        return response
+
+    def process_template_response(self, request, response):
+        # Ответы DRF сериализуются при render() после выхода из view
+        metrics = current.get()
+        started = time.perf_counter()
+
+        def rendered(response):
+            if metrics is not None:
+                metrics.render += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
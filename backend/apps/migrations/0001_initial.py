@@ -0,0 +1,138 @@
+# Generated by Django 4.2.3 on 2026-10-17 22:42
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Bid',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.IntegerField()),
+                ('votes_for', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'bid',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BidVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.IntegerField(blank=True, null=True)),
+                ('votes_for', models.IntegerField(blank=True, null=True)),
+                ('bid_id', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'bid_version',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=50, unique=True)),
+                ('first_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('last_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'employee',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Organization',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('type', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'organization',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizationResponsible',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'organization_responsible',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'review',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Tender',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('service_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'tender',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TenderVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('service_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('status', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.IntegerField(blank=True, null=True)),
+                ('tender_id', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'tender_version',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ('apps', '0001_initial'),
+    ]
+
+    operations = [
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS tender_status_created_id_idx '
+            'ON tender (status, created_at, id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS tender_status_created_id_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS tender_creator_created_id_idx '
+            'ON tender (creator_username, created_at, id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS tender_creator_created_id_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS bid_tender_created_id_idx '
+            'ON bid (tender_id, created_at, id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS bid_tender_created_id_idx;',
+        ),
+    ]
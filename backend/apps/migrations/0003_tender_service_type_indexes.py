@@ -0,0 +1,30 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ('apps', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        TrigramExtension(),
+        # Точный фильтр service_type IN (...) по опубликованным тендерам
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS tender_published_service_type_name_idx '
+            "ON tender (service_type, name) WHERE status = 'PUBLISHED';",
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS tender_published_service_type_name_idx;',
+        ),
+        # Поиск по подстроке (service_type_match=contains): выражение совпадает с __icontains
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS tender_published_service_type_trgm_idx '
+            'ON tender USING gin ((UPPER(service_type::text)) gin_trgm_ops) '
+            "WHERE status = 'PUBLISHED';",
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS tender_published_service_type_trgm_idx;',
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_index(name, table, columns, unique=False):
+    kind = 'UNIQUE INDEX' if unique else 'INDEX'
+    return migrations.RunSQL(
+        f'CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns});',
+        reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS {name};',
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    # Если в tender_version/bid_version уже есть дубли (id, version), уникальный индекс
+    # не построится (останется INVALID): дубли нужно удалить и перезапустить миграцию.
+    atomic = False
+
+    dependencies = [
+        ('apps', '0003_tender_service_type_indexes'),
+    ]
+
+    operations = [
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        create_index('bid_tender_status_idx', 'bid', 'tender_id, status'),
+        create_index('bid_creator_username_idx', 'bid', 'creator_username'),
+        create_index('tender_status_service_type_idx', 'tender', 'status, service_type'),
+        create_index('tender_version_tender_version_uniq', 'tender_version', 'tender_id, version', unique=True),
+        create_index('bid_version_bid_version_uniq', 'bid_version', 'bid_id, version', unique=True),
+        create_index('review_bid_idx', 'review', 'bid_id'),
+        create_index('organization_responsible_user_org_idx', 'organization_responsible', 'user_id, organization_id'),
+    ]
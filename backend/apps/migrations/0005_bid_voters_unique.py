@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    # Дубли голосов (bid_id, employee_id) нужно удалить до применения миграции.
+    atomic = False
+
+    dependencies = [
+        ('apps', '0004_index_set'),
+    ]
+
+    operations = [
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        # Один голос на пару (bid, employee): на нем держится INSERT ... ON CONFLICT DO NOTHING
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS bid_voters_bid_employee_uniq '
+            'ON bid_voters (bid_id, employee_id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS bid_voters_bid_employee_uniq;',
+        ),
+    ]
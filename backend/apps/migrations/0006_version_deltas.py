@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0005_bid_voters_unique'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'ALTER TABLE tender_version '
+            'ADD COLUMN IF NOT EXISTS changed_fields jsonb, '
+            'ADD COLUMN IF NOT EXISTS description_compressed bytea;',
+            reverse_sql='ALTER TABLE tender_version '
+            'DROP COLUMN IF EXISTS changed_fields, '
+            'DROP COLUMN IF EXISTS description_compressed;',
+            state_operations=[
+                migrations.AddField(
+                    model_name='tenderversion',
+                    name='changed_fields',
+                    field=models.JSONField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name='tenderversion',
+                    name='description_compressed',
+                    field=models.BinaryField(blank=True, null=True),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            'ALTER TABLE bid_version '
+            'ADD COLUMN IF NOT EXISTS changed_fields jsonb, '
+            'ADD COLUMN IF NOT EXISTS description_compressed bytea;',
+            reverse_sql='ALTER TABLE bid_version '
+            'DROP COLUMN IF EXISTS changed_fields, '
+            'DROP COLUMN IF EXISTS description_compressed;',
+            state_operations=[
+                migrations.AddField(
+                    model_name='bidversion',
+                    name='changed_fields',
+                    field=models.JSONField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name='bidversion',
+                    name='description_compressed',
+                    field=models.BinaryField(blank=True, null=True),
+                ),
+            ],
+        ),
+    ]
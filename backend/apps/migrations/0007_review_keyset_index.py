@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ('apps', '0006_version_deltas'),
+    ]
+
+    operations = [
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        # Отзывы по предложениям в порядке (created_at, id) для get_reviews
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS review_bid_created_at_idx ON review (bid_id, created_at, id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS review_bid_created_at_idx;',
+        ),
+        # review_bid_idx (bid_id) - префикс нового индекса
+        migrations.RunSQL(
+            'DROP INDEX CONCURRENTLY IF EXISTS review_bid_idx;',
+            reverse_sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS review_bid_idx ON review (bid_id);',
+        ),
+    ]
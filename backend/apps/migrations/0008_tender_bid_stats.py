@@ -0,0 +1,161 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+CREATE_TABLE = '''
+CREATE TABLE IF NOT EXISTS tender_bid_stats (
+    tender_id bigint PRIMARY KEY,
+    bids integer NOT NULL DEFAULT 0,
+    created integer NOT NULL DEFAULT 0,
+    published integer NOT NULL DEFAULT 0,
+    canceled integer NOT NULL DEFAULT 0,
+    approved integer NOT NULL DEFAULT 0,
+    votes_for bigint NOT NULL DEFAULT 0,
+    last_bid_at timestamptz,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+'''
+
+# Добавляет (sign = 1) или вычитает (sign = -1) одно предложение из сводки тендера.
+# created_at при вычитании передается, только если предложение могло быть последним:
+# максимум нельзя уменьшить приращением, он пересчитывается по индексу bid (tender_id, created_at, id).
+CREATE_FUNCTIONS = '''
+CREATE OR REPLACE FUNCTION tender_bid_stats_add(
+    p_tender_id bigint, p_sign integer, p_status text, p_votes_for bigint, p_created_at timestamptz
+) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    IF p_tender_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO tender_bid_stats AS s
+        (tender_id, bids, created, published, canceled, approved, votes_for, last_bid_at, updated_at)
+    VALUES (
+        p_tender_id,
+        p_sign,
+        p_sign * (p_status IS NOT DISTINCT FROM 'CREATED')::integer,
+        p_sign * (p_status IS NOT DISTINCT FROM 'PUBLISHED')::integer,
+        p_sign * (p_status IS NOT DISTINCT FROM 'CANCELED')::integer,
+        p_sign * (p_status IS NOT DISTINCT FROM 'APPROVED')::integer,
+        p_sign * coalesce(p_votes_for, 0),
+        CASE WHEN p_sign > 0 THEN p_created_at END,
+        now()
+    )
+    ON CONFLICT (tender_id) DO UPDATE SET
+        bids = s.bids + EXCLUDED.bids,
+        created = s.created + EXCLUDED.created,
+        published = s.published + EXCLUDED.published,
+        canceled = s.canceled + EXCLUDED.canceled,
+        approved = s.approved + EXCLUDED.approved,
+        votes_for = s.votes_for + EXCLUDED.votes_for,
+        last_bid_at = GREATEST(s.last_bid_at, EXCLUDED.last_bid_at),
+        updated_at = EXCLUDED.updated_at;
+
+    IF p_sign < 0 AND p_created_at IS NOT NULL THEN
+        UPDATE tender_bid_stats
+        SET last_bid_at = (SELECT max(created_at) FROM bid WHERE tender_id = p_tender_id)
+        WHERE tender_id = p_tender_id AND last_bid_at <= p_created_at;
+    END IF;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tender_bid_stats_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM tender_bid_stats_add(NEW.tender_id, 1, NEW.status::text, NEW.votes_for, NEW.created_at);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM tender_bid_stats_add(OLD.tender_id, -1, OLD.status::text, OLD.votes_for, OLD.created_at);
+    ELSE
+        PERFORM tender_bid_stats_add(
+            OLD.tender_id, -1, OLD.status::text, OLD.votes_for,
+            CASE WHEN OLD.tender_id IS DISTINCT FROM NEW.tender_id OR OLD.created_at IS DISTINCT FROM NEW.created_at
+                 THEN OLD.created_at END
+        );
+        PERFORM tender_bid_stats_add(NEW.tender_id, 1, NEW.status::text, NEW.votes_for, NEW.created_at);
+    END IF;
+    RETURN NULL;
+END
+$$;
+'''
+
+DROP_FUNCTIONS = '''
+DROP FUNCTION IF EXISTS tender_bid_stats_trigger();
+DROP FUNCTION IF EXISTS tender_bid_stats_add(bigint, integer, text, bigint, timestamptz);
+'''
+
+# Правки названия и описания сводку не меняют: UPDATE-триггер срабатывает только на ее поля
+CREATE_TRIGGERS = '''
+DROP TRIGGER IF EXISTS tender_bid_stats_insert_delete ON bid;
+CREATE TRIGGER tender_bid_stats_insert_delete
+    AFTER INSERT OR DELETE ON bid
+    FOR EACH ROW EXECUTE FUNCTION tender_bid_stats_trigger();
+
+DROP TRIGGER IF EXISTS tender_bid_stats_update ON bid;
+CREATE TRIGGER tender_bid_stats_update
+    AFTER UPDATE OF tender_id, status, votes_for, created_at ON bid
+    FOR EACH ROW
+    WHEN (OLD.tender_id IS DISTINCT FROM NEW.tender_id OR OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.votes_for IS DISTINCT FROM NEW.votes_for OR OLD.created_at IS DISTINCT FROM NEW.created_at)
+    EXECUTE FUNCTION tender_bid_stats_trigger();
+'''
+
+DROP_TRIGGERS = '''
+DROP TRIGGER IF EXISTS tender_bid_stats_update ON bid;
+DROP TRIGGER IF EXISTS tender_bid_stats_insert_delete ON bid;
+'''
+
+# Начальное заполнение в той же транзакции, что и триггеры: CREATE TRIGGER держит
+# блокировку bid до ее конца, изменения предложений не проходят мимо сводки
+BACKFILL = '''
+INSERT INTO tender_bid_stats
+    (tender_id, bids, created, published, canceled, approved, votes_for, last_bid_at, updated_at)
+SELECT tender_id, count(*),
+       count(*) FILTER (WHERE status::text = 'CREATED'),
+       count(*) FILTER (WHERE status::text = 'PUBLISHED'),
+       count(*) FILTER (WHERE status::text = 'CANCELED'),
+       count(*) FILTER (WHERE status::text = 'APPROVED'),
+       coalesce(sum(votes_for), 0), max(created_at), now()
+FROM bid
+WHERE tender_id IS NOT NULL
+GROUP BY tender_id
+ON CONFLICT (tender_id) DO NOTHING;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0007_review_keyset_index'),
+    ]
+
+    operations = [
+        # Заполнение читает всю таблицу bid
+        migrations.RunSQL('SET LOCAL statement_timeout = 0;', reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            CREATE_TABLE,
+            reverse_sql='DROP TABLE IF EXISTS tender_bid_stats;',
+            state_operations=[
+                migrations.CreateModel(
+                    name='TenderBidStats',
+                    fields=[
+                        ('tender', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='bid_stats', serialize=False, to='apps.tender')),
+                        ('bids', models.IntegerField()),
+                        ('created', models.IntegerField()),
+                        ('published', models.IntegerField()),
+                        ('canceled', models.IntegerField()),
+                        ('approved', models.IntegerField()),
+                        ('votes_for', models.BigIntegerField()),
+                        ('last_bid_at', models.DateTimeField(blank=True, null=True)),
+                        ('updated_at', models.DateTimeField()),
+                    ],
+                    options={
+                        'db_table': 'tender_bid_stats',
+                        'managed': False,
+                    },
+                ),
+            ],
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS, reverse_sql=DROP_FUNCTIONS),
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations, models
+
+
+CREATE_TABLES = '''
+CREATE TABLE IF NOT EXISTS change_sequence (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    value bigint NOT NULL
+);
+INSERT INTO change_sequence (id, value) VALUES (true, 0) ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS change_event (
+    seq bigint PRIMARY KEY,
+    entity text NOT NULL,
+    entity_id bigint NOT NULL,
+    event text NOT NULL,
+    status text,
+    version integer,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+'''
+
+DROP_TABLES = '''
+DROP TABLE IF EXISTS change_event;
+DROP TABLE IF EXISTS change_sequence;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0008_tender_bid_stats'),
+    ]
+
+    operations = [
+        # Номер события - из однострочного счетчика change_sequence, а не из sequence:
+        # блокировка строки до конца транзакции фиксирует номера по порядку (см. changes.py)
+        migrations.RunSQL(
+            CREATE_TABLES,
+            reverse_sql=DROP_TABLES,
+            state_operations=[
+                migrations.CreateModel(
+                    name='ChangeEvent',
+                    fields=[
+                        ('seq', models.BigIntegerField(primary_key=True, serialize=False)),
+                        ('entity', models.TextField()),
+                        ('entity_id', models.BigIntegerField()),
+                        ('event', models.TextField()),
+                        ('status', models.TextField(blank=True, null=True)),
+                        ('version', models.IntegerField(blank=True, null=True)),
+                        ('created_at', models.DateTimeField()),
+                    ],
+                    options={
+                        'db_table': 'change_event',
+                        'managed': False,
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+# updated_at ставит БД: строки меняются и ORM, и сырым SQL (решения, откаты, смена статуса),
+# и каждый такой путь иначе пришлось бы помнить. Откат восстанавливает старое updated_at -
+# триггер заменяет его временем отката, поэтому выгрузка с updatedSince его не пропустит
+CREATE_TRIGGERS = '''
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS tender_touch_updated_at ON tender;
+CREATE TRIGGER tender_touch_updated_at
+    BEFORE UPDATE ON tender
+    FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS bid_touch_updated_at ON bid;
+CREATE TRIGGER bid_touch_updated_at
+    BEFORE UPDATE ON bid
+    FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION touch_updated_at();
+'''
+
+DROP_TRIGGERS = '''
+DROP TRIGGER IF EXISTS bid_touch_updated_at ON bid;
+DROP TRIGGER IF EXISTS tender_touch_updated_at ON tender;
+DROP FUNCTION IF EXISTS touch_updated_at();
+'''
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ('apps', '0009_change_event'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+        # Построение индекса может идти дольше DB_STATEMENT_TIMEOUT
+        migrations.RunSQL('SET statement_timeout = 0;', reverse_sql='SET statement_timeout = 0;'),
+        # Выгрузка с updatedSince: COALESCE(updated_at, created_at) >= ... (exports.updated_since_filter)
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS tender_changed_at_idx ON tender ((COALESCE(updated_at, created_at)));',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS tender_changed_at_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS bid_changed_at_idx ON bid ((COALESCE(updated_at, created_at)));',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS bid_changed_at_idx;',
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+# Номер события - из sequence, а не из однострочного счетчика: строка счетчика была
+# заблокирована от записи события до COMMIT, и все изменения фиксировались по одному
+# (backend.benchmarks.change_feed). Порядок чтения без пропусков держит changes.settled_rows
+CREATE_SEQUENCE = '''
+CREATE SEQUENCE IF NOT EXISTS change_event_seq OWNED BY change_event.seq;
+SELECT setval('change_event_seq', GREATEST(value, 1), value > 0) FROM change_sequence;
+ALTER TABLE change_event ALTER COLUMN seq SET DEFAULT nextval('change_event_seq');
+DROP TABLE change_sequence;
+'''
+
+DROP_SEQUENCE = '''
+CREATE TABLE change_sequence (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    value bigint NOT NULL
+);
+INSERT INTO change_sequence (id, value) SELECT true, COALESCE(max(seq), 0) FROM change_event;
+ALTER TABLE change_event ALTER COLUMN seq DROP DEFAULT;
+DROP SEQUENCE change_event_seq;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0010_updated_at_triggers'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEQUENCE, reverse_sql=DROP_SEQUENCE),
+    ]
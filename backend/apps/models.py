@@ -84,6 +84,8 @@ class BidVersion(models.Model):
     version = models.IntegerField(blank=True, null=True)
     votes_for = models.IntegerField(blank=True, null=True)
     bid_id = models.IntegerField()
+    changed_fields = models.JSONField(blank=True, null=True)
+    description_compressed = models.BinaryField(blank=True, null=True)
 
     class Meta:
         managed = False
@@ -101,6 +103,8 @@ class TenderVersion(models.Model):
     updated_at = models.DateTimeField(blank=True, null=True)
     version = models.IntegerField(blank=True, null=True)
     tender_id = models.IntegerField()
+    changed_fields = models.JSONField(blank=True, null=True)
+    description_compressed = models.BinaryField(blank=True, null=True)
 
     class Meta:
         managed = False
@@ -118,3 +122,40 @@ class Review(models.Model):
     class Meta:
         managed = False
         db_table = 'review'
+
+
+class TenderBidStats(models.Model):
+    """
+    Сводка по предложениям тендера. Поддерживается триггером на bid (миграция 0008),
+    пересчитывается командой rebuild_tender_bid_stats.
+    """
+    tender = models.OneToOneField(Tender, models.DO_NOTHING, primary_key=True, related_name='bid_stats')
+    bids = models.IntegerField()
+    created = models.IntegerField()
+    published = models.IntegerField()
+    canceled = models.IntegerField()
+    approved = models.IntegerField()
+    votes_for = models.BigIntegerField()
+    last_bid_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'tender_bid_stats'
+
+
+class ChangeEvent(models.Model):
+    """
+    Событие ленты изменений (outbox): пишется в транзакции изменения, см. changes.py.
+    """
+    seq = models.BigIntegerField(primary_key=True)
+    entity = models.TextField()
+    entity_id = models.BigIntegerField()
+    event = models.TextField()
+    status = models.TextField(blank=True, null=True)
+    version = models.IntegerField(blank=True, null=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'change_event'
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+# Стабильный порядок для всех списков: (created_at, id).
+# NULL-значения created_at идут в конце (NULLS LAST) - это порядок
+# индексов (..., created_at, id) в PostgreSQL.
+KEYSET_ORDERING = (F('created_at').asc(nulls_last=True), 'id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj):
+    """
+    Непрозрачный курсор из (created_at, id) последней записи страницы
+    (объект модели или строка из .values()).
+    """
+    if isinstance(obj, dict):
+        created_at, pk = obj['created_at'], obj['id']
+    else:
+        created_at, pk = obj.created_at, obj.pk
+    created_at = created_at.isoformat() if created_at else None
+    payload = json.dumps([created_at, str(pk)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model):
+    """
+    Разбор курсора в пару (created_at, id). Бросает InvalidCursor при ошибке.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        pk = model._meta.pk.to_python(pk)
+    except (ValueError, TypeError, binascii.Error, ValidationError):
+        raise InvalidCursor(token)
+    return created_at, pk
+
+
+def keyset_querysets(queryset, token):
+    """
+    Запросы страницы по курсору: (основной, дополнение записями без created_at или None).
+    """
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if not token:
+        return queryset, None
+
+    created_at, pk = decode_cursor(token, queryset.model)
+    if created_at is None:
+        return queryset.filter(created_at__isnull=True, id__gt=pk), None
+    # created_at >= x задает начало диапазона в индексе, остальное - фильтр по id
+    return (
+        queryset.filter(created_at__gte=created_at)
+        .filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)),
+        # Записи без created_at идут после всех датированных
+        queryset.filter(created_at__isnull=True),
+    )
+
+
+def keyset_result(page, limit):
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit and limit else None
+    return page[:limit], next_cursor
+
+
+def keyset_page(queryset, token, limit):
+    """
+    Страница по курсору: WHERE (created_at, id) > (курсор) ORDER BY created_at, id LIMIT n.
+    Стоимость не зависит от глубины страницы. Возвращает (записи, nextCursor).
+    """
+    limit = max(limit, 0)
+    main, tail = keyset_querysets(queryset, token)
+    page = list(main[:limit + 1])
+    if tail is not None and len(page) <= limit:
+        page += list(tail[:limit + 1 - len(page)])
+    return keyset_result(page, limit)
+
+
+async def akeyset_page(queryset, token, limit):
+    """
+    keyset_page() для async views (async ORM).
+    """
+    limit = max(limit, 0)
+    main, tail = keyset_querysets(queryset, token)
+    page = [row async for row in main[:limit + 1]]
+    if tail is not None and len(page) <= limit:
+        page += [row async for row in tail[:limit + 1 - len(page)]]
+    return keyset_result(page, limit)
@@ -0,0 +1,122 @@
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication
+
+from .cache import MISSING, TieredCache
+from .models import Employee
+
+
+# Параметры, в которых API передает имя вызывающего пользователя
+USERNAME_PARAMS = ('username', 'requestUsername', 'creatorUsername')
+
+EMPLOYEE_FIELDS = ('id', 'username', 'first_name', 'last_name', 'created_at', 'updated_at')
+
+# username -> (поля Employee, id организаций); сбрасывается сигналами из signals.py
+caller_cache = TieredCache(
+    'caller',
+    ttl=settings.CALLER_CACHE_TTL,
+    local_ttl=settings.CALLER_CACHE_LOCAL_TTL,
+    local_maxsize=settings.CALLER_CACHE_MAXSIZE,
+    alias=settings.CALLER_CACHE_ALIAS,
+)
+
+
+class Caller:
+    """
+    Вызывающий пользователь и множество организаций, за которые он ответственен.
+    employee = None, если пользователь с таким username не существует.
+    """
+
+    def __init__(self, username, employee=None, organization_ids=()):
+        self.username = username
+        self.employee = employee
+        self.organization_ids = frozenset(organization_ids)
+
+    def is_responsible(self, organization_id):
+        return organization_id in self.organization_ids
+
+
+def caller_rows(username):
+    """
+    Пользователь вместе с id его организаций одним запросом (LEFT JOIN organization_responsible).
+    """
+    return Employee.objects.filter(username=username).values(*EMPLOYEE_FIELDS, 'organizationresponsible__organization_id')
+
+
+def caller_entry(rows):
+    """
+    Запись caller_cache (поля Employee, id организаций) по строкам caller_rows() или None, если строк нет.
+    """
+    if not rows:
+        return None
+    values = [rows[0][field] for field in EMPLOYEE_FIELDS]
+    organization_ids = [
+        row['organizationresponsible__organization_id'] for row in rows
+        if row['organizationresponsible__organization_id'] is not None
+    ]
+    return values, organization_ids
+
+
+def build_caller(username, entry):
+    """
+    Caller по записи caller_cache; None - пользователь не существует.
+    """
+    if entry is None:
+        return Caller(username)
+    values, organization_ids = entry
+    return Caller(username, Employee.from_db(Employee.objects.db, EMPLOYEE_FIELDS, values), organization_ids)
+
+
+def load_caller(username):
+    """
+    Загрузка пользователя вместе с его организациями: из caller_cache, либо одним запросом.
+    """
+    entry = caller_cache.get(username)
+    if entry is MISSING:
+        entry = caller_entry(list(caller_rows(username)))
+        if entry is not None:
+            caller_cache.set(username, entry)
+    return build_caller(username, entry)
+
+
+async def aload_caller(username):
+    """
+    load_caller() для async views (async ORM).
+    """
+    entry = await caller_cache.aget(username)
+    if entry is MISSING:
+        entry = caller_entry([row async for row in caller_rows(username)])
+        if entry is not None:
+            await caller_cache.aset(username, entry)
+    return build_caller(username, entry)
+
+
+def get_caller(request, username):
+    """
+    Контекст пользователя для view: переиспользует загруженный при аутентификации,
+    если username совпадает, иначе загружает заново.
+    """
+    caller = getattr(request, 'caller', None)
+    if caller is None or caller.username != username:
+        caller = load_caller(username)
+        request.caller = caller
+    return caller
+
+
+class CallerAuthentication(BaseAuthentication):
+    """
+    Определяет вызывающего пользователя по username/requestUsername/creatorUsername
+    из строки запроса и прикрепляет его к request.caller. Тело запроса не читается:
+    его разбор остается view (ошибки формата, 405 раньше 415); пользователя из тела
+    view загружает через get_caller(). Всегда возвращает None, чтобы не подменять
+    request.user и не мешать остальным классам аутентификации.
+    """
+
+    def authenticate(self, request):
+        username = None
+        for param in USERNAME_PARAMS:
+            username = request.query_params.get(param)
+            if username:
+                break
+
+        request.caller = load_caller(username) if username else None
+        return None
@@ -0,0 +1,59 @@
+import copy
+
+from django.db import models
+from django.utils import timezone
+
+
+def format_datetime(value, tz):
+    """
+    Дата-время как в rest_framework DateTimeField (ISO 8601 в часовом поясе tz).
+    """
+    if not value:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class RowReader:
+    """
+    Быстрый путь чтения для списков: строки через .values() и заранее
+    собранное отображение столбцов в поля сериализатора вместо ModelSerializer.
+    Результат совпадает с serializer_class(many=True).data для тех же строк.
+    """
+
+    def __init__(self, serializer_class):
+        model = serializer_class.Meta.model
+        self.mapping = []
+        for name in serializer_class.Meta.fields:
+            field = model._meta.get_field(name)
+            converter = format_datetime if isinstance(field, models.DateTimeField) else None
+            self.mapping.append((name, field.attname, converter))
+        self.columns = [column for _, column, _ in self.mapping]
+
+    def extend(self, fields):
+        """
+        Копия с дополнительными полями: fields - пары (имя в ответе, столбец для .values(), в т.ч. через JOIN).
+        """
+        reader = copy.copy(self)
+        reader.mapping = self.mapping + [(name, column, None) for name, column in fields]
+        reader.columns = [column for _, column, _ in reader.mapping]
+        return reader
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def map(self, row, tz):
+        return {
+            name: converter(row[column], tz) if converter else row[column]
+            for name, column, converter in self.mapping
+        }
+
+    def read(self, rows):
+        # Текущий часовой пояс определяется один раз на список, а не на каждое поле
+        tz = timezone.get_current_timezone()
+        return [self.map(row, tz) for row in rows]
+
+    def read_objects(self, objects):
+        return self.read({column: getattr(obj, column) for column in self.columns} for obj in objects)
@@ -0,0 +1,56 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# Типы, которые orjson не знает (Decimal, lazy-строки, timedelta, QuerySet...),
+# кодируются так же, как в rest_framework JSONRenderer
+_encoder = JSONEncoder()
+
+
+def render_json(data, option=0):
+    """
+    Сериализация в JSON через orjson, байт в байт как rest_framework JSONRenderer
+    с настройками по умолчанию (компактно, без экранирования не-ASCII, с \\u2028/\\u2029).
+    """
+    body = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_UTC_Z | option)
+    return body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson: UUID и datetime кодируются нативно, остальное - как в DRF.
+    Отступ (параметр indent типа ответа или renderer_context) - как в JSONRenderer;
+    orjson умеет только 2 пробела, другие отступы рендерит JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None:
+            return render_json(data)
+        if indent == 2:
+            return render_json(data, orjson.OPT_INDENT_2)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser на orjson; тела не в UTF-8 разбирает JSONParser.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Tender, Bid, BidVersion, TenderVersion, Review
+from .models import Tender, Bid, BidVersion, TenderVersion, Review, ChangeEvent
 
 
 class TenderSerializer(serializers.ModelSerializer):
@@ -19,6 +19,14 @@ class TenderSerializer(serializers.ModelSerializer):
         ]
 
 
+class TenderEditSerializer(TenderSerializer):
+    """
+    Правка тендера: версию увеличивает сервер, из тела запроса она не принимается.
+    """
+    class Meta(TenderSerializer.Meta):
+        read_only_fields = ['version']
+
+
 class BidSerializer(serializers.ModelSerializer):
     class Meta:
         model = Bid
@@ -37,6 +45,14 @@ class BidSerializer(serializers.ModelSerializer):
         ]
 
 
+class BidEditSerializer(BidSerializer):
+    """
+    Правка предложения: версию увеличивает сервер, из тела запроса она не принимается.
+    """
+    class Meta(BidSerializer.Meta):
+        read_only_fields = ['version']
+
+
 class BidVersionSerializer(serializers.ModelSerializer):
     class Meta:
         model = BidVersion
@@ -77,3 +93,35 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ['id', 'bid', 'user', 'content', 'created_at']
+
+
+class TenderFieldsSerializer(serializers.ModelSerializer):
+    """
+    Проверка собственных полей тендера без связей (связи проверяются отдельно, без запросов на каждый объект).
+    """
+    class Meta:
+        model = Tender
+        fields = ['name', 'description', 'service_type', 'version']
+
+
+class BidFieldsSerializer(serializers.ModelSerializer):
+    """
+    Проверка собственных полей предложения без связей (связи проверяются отдельно, без запросов на каждый объект).
+    """
+    class Meta:
+        model = Bid
+        fields = ['name', 'description']
+
+
+class ChangeEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChangeEvent
+        fields = [
+            'seq',
+            'entity',
+            'entity_id',
+            'event',
+            'status',
+            'version',
+            'created_at'
+        ]
@@ -0,0 +1,146 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .cache import MISSING, TieredCache
+from .changes import STATUS, VOTED, record_changes
+from .models import OrganizationResponsible
+
+
+# Кэш публичной ленты тендеров; поколение кэша - "поколение тендеров".
+# Используется, только если включен TENDER_FEED_CACHE (см. settings.py)
+tender_feed_cache = TieredCache(
+    'tenders',
+    ttl=settings.TENDER_FEED_CACHE_TTL,
+    local_ttl=settings.TENDER_FEED_CACHE_LOCAL_TTL,
+    local_maxsize=settings.TENDER_FEED_CACHE_MAXSIZE,
+    alias=settings.TENDER_FEED_CACHE_ALIAS,
+)
+
+
+def invalidate_tender_feed():
+    """
+    Увеличить поколение тендеров после фиксации текущей транзакции.
+    """
+    transaction.on_commit(tender_feed_cache.invalidate)
+
+
+def tender_feed_key(params):
+    """
+    Ключ ленты по нормализованным параметрам запроса.
+    """
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def tender_feed_etag(key, generation):
+    """
+    ETag ленты: поколение тендеров + параметры. Вычисляется без обращения к БД.
+    """
+    return f'"{generation}-{key[:16]}"'
+
+
+# Кворум: min(MAX_QUORUM, число ответственных за организацию тендера)
+MAX_QUORUM = 3
+
+# Итоги decide_bid
+BID_NOT_FOUND = 'bid_not_found'
+ALREADY_VOTED = 'already_voted'
+TENDER_CLOSED = 'tender_closed'
+BID_SETTLED = 'bid_settled'
+DECLINED = 'declined'
+ACCEPTED = 'accepted'
+APPROVED = 'approved'
+
+# Статусы предложения, после которых решения не принимаются
+SETTLED_BID_STATUSES = ('APPROVED', 'CANCELED')
+
+# Число ответственных по id организации; сбрасывается сигналами из signals.py
+responsible_count_cache = TieredCache(
+    'responsible-count',
+    ttl=settings.CALLER_CACHE_TTL,
+    local_ttl=settings.CALLER_CACHE_LOCAL_TTL,
+    local_maxsize=settings.CALLER_CACHE_MAXSIZE,
+    alias=settings.CALLER_CACHE_ALIAS,
+)
+
+
+def quorum(organization_id):
+    """
+    Число голосов "за", достаточное для принятия предложения.
+    """
+    count = responsible_count_cache.get(str(organization_id))
+    if count is MISSING:
+        count = OrganizationResponsible.objects.filter(organization_id=organization_id).count()
+        responsible_count_cache.set(str(organization_id), count)
+    return max(1, min(MAX_QUORUM, count))
+
+
+def decide_bid(bid_id, organization_id, employee_id, decision):
+    """
+    Решение по предложению за O(1) запросов в одной транзакции.
+
+    Строка тендера блокируется первой, поэтому решения по одному тендеру выполняются
+    по очереди и без взаимных блокировок. Голос (bid, employee) вставляется с
+    ON CONFLICT DO NOTHING. Decline сразу отклоняет предложение. Accept увеличивает
+    votes_for; при достижении кворума предложение принимается, тендер закрывается,
+    остальные предложения тендера отклоняются одним UPDATE.
+    События ленты изменений пишутся последним запросом транзакции.
+    employee_id должен быть ответственным за organization_id: это проверяет вызывающий.
+    Если предложение успели удалить - BID_NOT_FOUND.
+    Возвращает (итог, votes_for, updated_at предложения после голоса).
+    """
+    required = quorum(organization_id)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT t.id, t.status, b.status FROM bid b JOIN tender t ON t.id = b.tender_id '
+                'WHERE b.id = %s FOR UPDATE OF t',
+                [bid_id],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return BID_NOT_FOUND, None, None
+            tender_id, tender_status, bid_status = row
+            if tender_status == 'CLOSED':
+                return TENDER_CLOSED, None, None
+            if bid_status in SETTLED_BID_STATUSES:
+                return BID_SETTLED, None, None
+
+            cursor.execute(
+                'INSERT INTO bid_voters (bid_id, employee_id) VALUES (%s, %s) '
+                'ON CONFLICT DO NOTHING RETURNING 1',
+                [bid_id, employee_id],
+            )
+            if cursor.fetchone() is None:
+                return ALREADY_VOTED, None, None
+
+            if decision == 'Decline':
+                cursor.execute("UPDATE bid SET status = 'CANCELED' WHERE id = %s RETURNING version", [bid_id])
+                record_changes([('bid', bid_id, STATUS, 'CANCELED', cursor.fetchone()[0])])
+                return DECLINED, None, None
+
+            cursor.execute(
+                'UPDATE bid SET votes_for = votes_for + 1 WHERE id = %s RETURNING votes_for, version, updated_at',
+                [bid_id],
+            )
+            votes_for, version, updated_at = cursor.fetchone()
+            if votes_for < required:
+                record_changes([('bid', bid_id, VOTED, bid_status, version)])
+                return ACCEPTED, votes_for, updated_at
+
+            cursor.execute("UPDATE bid SET status = 'APPROVED' WHERE id = %s", [bid_id])
+            changes = [('bid', bid_id, STATUS, 'APPROVED', version)]
+            cursor.execute("UPDATE tender SET status = 'CLOSED' WHERE id = %s RETURNING version", [tender_id])
+            changes.append(('tender', tender_id, STATUS, 'CLOSED', cursor.fetchone()[0]))
+            cursor.execute(
+                "UPDATE bid SET status = 'CANCELED' "
+                "WHERE tender_id = %s AND id <> %s AND status IS DISTINCT FROM 'CANCELED' RETURNING id, version",
+                [tender_id, bid_id],
+            )
+            changes.extend(('bid', canceled_id, STATUS, 'CANCELED', canceled_version)
+                           for canceled_id, canceled_version in cursor.fetchall())
+            record_changes(changes)
+        invalidate_tender_feed()
+    return APPROVED, votes_for, updated_at
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Employee, OrganizationResponsible
+from .permissions import caller_cache
+from .services import responsible_count_cache
+
+
+@receiver([post_save, post_delete], sender=OrganizationResponsible)
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_caller_cache(sender, **kwargs):
+    """
+    Сброс кэша пользователей при изменении organization_responsible или employee через ORM.
+    Изменения в обход ORM становятся видны по истечении CALLER_CACHE_TTL + CALLER_CACHE_LOCAL_TTL
+    (несколько секунд): срок жизни записей и есть граница устаревания.
+    """
+    caller_cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=OrganizationResponsible)
+def invalidate_responsible_count_cache(sender, **kwargs):
+    """
+    Сброс кэша числа ответственных (кворум решений по предложениям).
+    """
+    responsible_count_cache.invalidate()
@@ -0,0 +1,73 @@
+from django.db import connection, transaction
+
+
+# Сводка по предложениям одного или всех тендеров, пересчитанная по таблице bid
+ACTUAL_STATS = '''
+SELECT tender_id, count(*),
+       count(*) FILTER (WHERE status::text = 'CREATED'),
+       count(*) FILTER (WHERE status::text = 'PUBLISHED'),
+       count(*) FILTER (WHERE status::text = 'CANCELED'),
+       count(*) FILTER (WHERE status::text = 'APPROVED'),
+       coalesce(sum(votes_for), 0), max(created_at), now()
+FROM bid
+WHERE tender_id IS NOT NULL {condition}
+GROUP BY tender_id
+'''
+
+# Перезаписываются только разошедшиеся строки: rowcount - число исправленных
+UPSERT_STATS = '''
+INSERT INTO tender_bid_stats AS s
+    (tender_id, bids, created, published, canceled, approved, votes_for, last_bid_at, updated_at)
+{actual}
+ON CONFLICT (tender_id) DO UPDATE SET
+    bids = EXCLUDED.bids,
+    created = EXCLUDED.created,
+    published = EXCLUDED.published,
+    canceled = EXCLUDED.canceled,
+    approved = EXCLUDED.approved,
+    votes_for = EXCLUDED.votes_for,
+    last_bid_at = EXCLUDED.last_bid_at,
+    updated_at = EXCLUDED.updated_at
+WHERE (s.bids, s.created, s.published, s.canceled, s.approved, s.votes_for, s.last_bid_at)
+    IS DISTINCT FROM (EXCLUDED.bids, EXCLUDED.created, EXCLUDED.published, EXCLUDED.canceled,
+                      EXCLUDED.approved, EXCLUDED.votes_for, EXCLUDED.last_bid_at)
+'''
+
+DELETE_STALE = '''
+DELETE FROM tender_bid_stats s
+WHERE NOT EXISTS (SELECT 1 FROM bid b WHERE b.tender_id = s.tender_id) {condition}
+'''
+
+
+def rebuild_tender_bid_stats(tender_id=None):
+    """
+    Пересчет tender_bid_stats по таблице bid: всех тендеров или одного.
+
+    На время пересчета изменения сводки триггером ждут: полный пересчет берет
+    EXCLUSIVE на tender_bid_stats (чтение не блокируется), пересчет одного тендера -
+    блокировку его строки. Приращения транзакций, не попавших в пересчет, применяются
+    после него, поэтому параллельные изменения bid не теряются.
+    Возвращает {"updated": исправлено строк, "deleted": удалено строк без предложений}.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        inserted = False
+        if tender_id is None:
+            condition, params = '', []
+            cursor.execute('LOCK TABLE tender_bid_stats IN EXCLUSIVE MODE')
+        else:
+            condition, params = 'AND tender_id = %s', [tender_id]
+            # Строку без предложений вставляем, чтобы было что блокировать
+            cursor.execute(
+                'INSERT INTO tender_bid_stats (tender_id) VALUES (%s) ON CONFLICT DO NOTHING RETURNING 1',
+                [tender_id],
+            )
+            inserted = cursor.fetchone() is not None
+            cursor.execute('SELECT 1 FROM tender_bid_stats WHERE tender_id = %s FOR UPDATE', [tender_id])
+
+        cursor.execute(UPSERT_STATS.format(actual=ACTUAL_STATS.format(condition=condition)), params)
+        updated = cursor.rowcount
+        cursor.execute(DELETE_STALE.format(condition=condition.replace('tender_id', 's.tender_id')), params)
+        # При пересчете одного тендера удалить можно только его строку; если ее вставили
+        # выше как заглушку, до пересчета ее не было, и удалением это не считается
+        deleted = 0 if inserted else cursor.rowcount
+    return {'updated': updated, 'deleted': deleted}
@@ -0,0 +1,706 @@
+"""
+Тесты API: python -m django test backend.apps.tests --settings=backend.tenders_app.settings
+
+Таблицы приложения неуправляемые (managed = False), поэтому тестовая БД создается
+без миграций apps, а их таблицы - по моделям в setUpModule. На PostgreSQL затем
+применяются миграции apps (индексы, триггеры, лента изменений) - схема как в рабочей БД;
+тесты SQL, который есть только в PostgreSQL, на других СУБД пропускаются.
+"""
+import io
+import json
+import threading
+import time
+import uuid
+from datetime import timedelta
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import parse_http_date
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .cache import REGISTRY as CACHE_REGISTRY
+from .changes import settled_rows
+from .models import Bid, Employee, Organization, OrganizationResponsible, Review, Tender, TenderVersion
+from .permissions import aload_caller, load_caller
+from .renderers import ORJSONParser, ORJSONRenderer
+from .serializers import BidSerializer, TenderSerializer
+from .services import BID_NOT_FOUND, decide_bid
+from .stats import rebuild_tender_bid_stats
+from .versions import tender_versions
+
+# SQL, который есть только в PostgreSQL: лента изменений, откаты, решения по предложениям
+postgres_only = skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+
+
+# Таблицы, которые на PostgreSQL создают миграции apps (со значениями по умолчанию)
+MIGRATION_TABLES = {'tender_bid_stats', 'change_event'}
+
+
+def setUpModule():
+    existing = set(connection.introspection.table_names())
+    if connection.vendor == 'postgresql':
+        existing |= MIGRATION_TABLES
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config('apps').get_models():
+            if model._meta.db_table not in existing:
+                editor.create_model(model)
+    if connection.vendor == 'postgresql':
+        call_command('migrate', 'apps', verbosity=0)
+
+
+class Fixtures:
+    """
+    Организация с тремя ответственными (owner1-3), организация участника (bidder)
+    и опубликованный тендер первой организации.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(id=uuid.uuid4(), name='Owner')
+        cls.bidder_organization = Organization.objects.create(id=uuid.uuid4(), name='Bidder')
+        cls.owners = [Employee.objects.create(id=uuid.uuid4(), username=f'owner{i}') for i in range(1, 4)]
+        cls.bidder = Employee.objects.create(id=uuid.uuid4(), username='bidder')
+        cls.stranger = Employee.objects.create(id=uuid.uuid4(), username='stranger')
+        for owner in cls.owners:
+            OrganizationResponsible.objects.create(id=uuid.uuid4(), organization=cls.organization, user=owner)
+        OrganizationResponsible.objects.create(id=uuid.uuid4(), organization=cls.bidder_organization, user=cls.bidder)
+        cls.tender = Tender.objects.create(
+            name='Tender', description='Tender', service_type='Construction', status='PUBLISHED',
+            organization=cls.organization, creator_username=cls.owners[0], created_at=timezone.now(), version=1,
+        )
+
+    def setUp(self):
+        # Кэши живут между тестами, а строки тестов откатываются
+        for cache in CACHE_REGISTRY.values():
+            cache.invalidate()
+        self.client = APIClient()
+
+    def create_bid(self, **fields):
+        return Bid.objects.create(**{
+            'name': 'Bid', 'description': 'Bid', 'status': 'PUBLISHED', 'tender': self.tender,
+            'organization': self.bidder_organization, 'creator_username': self.bidder,
+            'created_at': timezone.now(), 'version': 1, 'votes_for': 0, **fields,
+        })
+
+
+class APITestCase(Fixtures, TestCase):
+    pass
+
+
+class SubmitDecisionTests(APITestCase):
+
+    def submit(self, bid, username, decision='Accept'):
+        return self.client.patch(
+            f'/api/bids/submit_decision?bidId={bid.id}&username={username}&decision={decision}'
+        )
+
+    def test_author_cannot_decide_on_own_bid(self):
+        bid = self.create_bid()
+        for decision in ('Accept', 'Decline'):
+            response = self.submit(bid, self.bidder.username, decision)
+            self.assertEqual(response.status_code, 403)
+
+        bid.refresh_from_db()
+        self.assertEqual((bid.status, bid.votes_for), ('PUBLISHED', 0))
+        self.assertFalse(bid.voters.exists())
+
+    def test_not_responsible_cannot_decide(self):
+        bid = self.create_bid()
+        response = self.submit(bid, self.stranger.username)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(bid.voters.exists())
+
+    @postgres_only
+    def test_quorum_approves_and_cancels_others(self):
+        bid, other = self.create_bid(), self.create_bid()
+        for owner in self.owners:
+            self.assertEqual(self.submit(bid, owner.username).status_code, 200)
+
+        self.assertEqual(Bid.objects.get(id=bid.id).status, 'APPROVED')
+        self.assertEqual(Bid.objects.get(id=other.id).status, 'CANCELED')
+        self.assertEqual(Tender.objects.get(id=self.tender.id).status, 'CLOSED')
+
+    @postgres_only
+    def test_deleted_bid(self):
+        bid = self.create_bid()
+        result = decide_bid(bid.id + 1000, self.organization.id, self.owners[0].id, 'Accept')
+        self.assertEqual(result, (BID_NOT_FOUND, None, None))
+
+
+@postgres_only
+class ConcurrentDecisionTests(Fixtures, TransactionTestCase):
+    """
+    Параллельные решения из разных потоков (каждый со своим соединением) по одному тендеру.
+    Таблицы apps неуправляемые, и flush их не очищает - это делает tearDown.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setUpTestData()
+        self.bids = [self.create_bid(), self.create_bid()]
+
+    def tearDown(self):
+        tables = ', '.join(model._meta.db_table for model in apps.get_app_config('apps').get_models())
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {tables} CASCADE')
+
+    def vote(self, barrier, results, bid, username):
+        client = APIClient()
+        try:
+            barrier.wait()
+            response = client.patch(
+                f'/api/bids/submit_decision?bidId={bid.id}&username={username}&decision=Accept'
+            )
+            results.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_single_winner(self):
+        """
+        Каждый из трех ответственных дважды голосует за каждое из двух предложений:
+        принято ровно одно, голоса не дублируются, votes_for победителя равно кворуму.
+        """
+        voters = [(bid, owner.username) for bid in self.bids for owner in self.owners] * 2
+        barrier, results = threading.Barrier(len(voters)), []
+        threads = [threading.Thread(target=self.vote, args=(barrier, results, *voter)) for voter in voters]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), len(voters))
+        self.assertTrue(set(results) <= {200, 403}, results)
+        approved = Bid.objects.filter(tender=self.tender, status='APPROVED')
+        self.assertEqual(approved.count(), 1)
+        self.assertEqual(approved.get().votes_for, 3)
+        self.assertEqual(Tender.objects.get(id=self.tender.id).status, 'CLOSED')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*), count(DISTINCT (bid_id, employee_id)) FROM bid_voters WHERE bid_id = ANY(%s)',
+                [[bid.id for bid in self.bids]],
+            )
+            total, distinct = cursor.fetchone()
+        self.assertEqual(total, distinct)
+
+
+class CreateBidTests(APITestCase):
+
+    def test_query_count(self):
+        """
+        Создание предложения без кэша пользователя: пользователь с организациями,
+        тендер с проверкой организации и INSERT - не больше 4 запросов.
+        """
+        body = {
+            'name': 'Bid', 'description': 'Bid', 'tenderId': self.tender.id,
+            'organizationId': str(self.bidder_organization.id), 'creatorUsername': self.bidder.username,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/bids/new', body, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertLessEqual(len(queries), 4, [query['sql'] for query in queries])
+        bid = Bid.objects.get(id=response.data['id'])
+        self.assertEqual((bid.tender_id, bid.creator_username_id), (self.tender.id, self.bidder.username))
+
+
+class BulkCreateTests(APITestCase):
+
+    def test_mixed_batch_reports_each_item(self):
+        """
+        Ошибочные объекты пачки получают свой код и причину, корректные создаются.
+        """
+        valid = {
+            'name': 'Bid', 'description': 'Bid', 'tenderId': self.tender.id,
+            'organizationId': str(self.bidder_organization.id), 'creatorUsername': self.bidder.username,
+        }
+        items = [
+            valid,
+            {**valid, 'name': None},
+            {**valid, 'creatorUsername': 'nobody'},
+            {**valid, 'tenderId': self.tender.id + 1000},
+            {**valid, 'organizationId': str(uuid.uuid4())},
+            {**valid, 'creatorUsername': self.owners[0].username},
+            {**valid, 'name': 'x' * 101},
+            'not an object',
+            {**valid, 'name': 'Second'},
+        ]
+        response = self.client.post('/api/bids/bulk', items, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual((result['created'], result['failed']), (2, 7))
+        self.assertEqual(
+            [item['status'] for item in result['items']], [201, 400, 400, 400, 400, 403, 400, 400, 201],
+        )
+        self.assertIn('name', result['items'][6]['errors'])
+        created = [item['bid']['id'] for item in result['items'] if item['status'] == 201]
+        self.assertEqual(
+            list(Bid.objects.filter(id__in=created).order_by('id').values_list('name', flat=True)), ['Bid', 'Second'],
+        )
+
+
+class BidVisibilityTests(APITestCase):
+
+    def visible(self, username=None):
+        params = {'limit': 10, **({'username': username} if username else {})}
+        response = self.client.get(f'/api/bids/{self.tender.id}/list', params)
+        self.assertEqual(response.status_code, 200)
+        return {bid['id'] for bid in response.json()}
+
+    def test_user_in_several_organizations(self):
+        """
+        Неопубликованные предложения видны ответственному за организацию тендера, даже если она -
+        не первая из его организаций, и автору предложения по тендеру; остальным - только опубликованные.
+        """
+        published, draft = self.create_bid(), self.create_bid(status='CREATED')
+        other = Organization.objects.create(id=uuid.uuid4(), name='Other')
+        multi, outsider = (Employee.objects.create(id=uuid.uuid4(), username=name) for name in ('multi', 'outsider'))
+        for organization in (other, self.bidder_organization, self.organization):
+            OrganizationResponsible.objects.create(id=uuid.uuid4(), organization=organization, user=multi)
+        for organization in (other, self.bidder_organization):
+            OrganizationResponsible.objects.create(id=uuid.uuid4(), organization=organization, user=outsider)
+
+        everything = {published.id, draft.id}
+        self.assertEqual(self.visible('multi'), everything)
+        self.assertEqual(self.visible(self.bidder.username), everything)
+        self.assertEqual(self.visible('outsider'), {published.id})
+        self.assertEqual(self.visible(), {published.id})
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(APITestCase):
+    """
+    Списки укладываются в QUERY_BUDGETS и на страницах курсора, доходящих до записей без created_at.
+    """
+
+    def walk(self, path, params):
+        items, cursor = [], ''
+        while cursor is not None:
+            for cache in CACHE_REGISTRY.values():
+                cache.invalidate()
+            response = self.client.get(path, {**params, 'limit': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            items += response.json()['items']
+            cursor = response.json()['nextCursor']
+        return items
+
+    def test_tender_lists(self):
+        for created_at in (timezone.now(), timezone.now(), None):
+            Tender.objects.create(
+                name='Tender', service_type='Delivery', status='PUBLISHED', organization=self.organization,
+                creator_username=self.owners[0], created_at=created_at, version=1,
+            )
+        self.assertEqual(len(self.walk('/api/tenders', {})), 4)
+        self.assertEqual(len(self.walk('/api/tenders/my', {'username': self.owners[0].username})), 4)
+
+
+class CursorPaginationTests(APITestCase):
+
+    def walk(self, path, params, limit):
+        items, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get(path, {**params, 'limit': limit, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            items += response.json()['items']
+            cursor = response.json()['nextCursor']
+        return [item['id'] for item in items]
+
+    def test_round_trip_matches_offset_order(self):
+        """
+        Страницы по курсору отдают все записи ровно один раз в порядке (created_at, id),
+        включая одинаковые created_at и хвост без created_at - как limit/offset.
+        """
+        now = timezone.now()
+        for created_at in (now, now, None, now - timezone.timedelta(days=1), None, now):
+            Tender.objects.create(
+                name='Tender', service_type='Delivery', status='PUBLISHED', organization=self.organization,
+                creator_username=self.owners[0], created_at=created_at, version=1,
+            )
+            self.create_bid(created_at=created_at)
+
+        tenders = [tender['id'] for tender in self.client.get('/api/tenders', {'limit': 100}).json()]
+        self.assertEqual(len(tenders), 7)
+        for limit in (1, 2, 3, 7):
+            self.assertEqual(self.walk('/api/tenders', {}, limit), tenders)
+
+        path = f'/api/bids/{self.tender.id}/list'
+        bids = [bid['id'] for bid in self.client.get(path, {'limit': 100}).json()]
+        self.assertEqual(len(bids), 6)
+        self.assertEqual(self.walk(path, {}, 4), bids)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tenders/my', {'username': self.owners[0].username, 'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TenderFeedCacheTests(APITestCase):
+
+    def test_etag_and_last_modified_follow_changes(self):
+        """
+        Повтор с If-None-Match - 304; после изменения тендеров - новый ETag,
+        а Last-Modified - время изменения, а не время отрисовки ответа.
+        """
+        response = self.client.get('/api/tenders')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get('/api/tenders', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        time.sleep(1)
+        self.assertEqual(self.client.get('/api/tenders', {'limit': 1})['Last-Modified'], last_modified)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/tenders/new', {
+                'name': 'Tender', 'description': 'Tender', 'serviceType': 'Delivery', 'version': 1,
+                'organizationId': str(self.organization.id), 'creatorUsername': self.owners[0].username,
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/api/tenders', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertGreater(parse_http_date(response['Last-Modified']), parse_http_date(last_modified))
+
+
+@postgres_only
+class EditTests(APITestCase):
+
+    def test_body_version_is_ignored(self):
+        """
+        version из тела правки не перезаписывает счетчик: версии идут подряд, и следующая правка проходит.
+        """
+        bid = self.create_bid()
+        paths = (
+            (f'/api/tenders/{self.tender.id}/edit', self.owners[0].username),
+            (f'/api/bids/{bid.id}/edit', self.bidder.username),
+        )
+        for path, username in paths:
+            for version, name in ((2, 'Renamed'), (3, 'Renamed again')):
+                response = self.client.patch(f'{path}?username={username}', {'name': name, 'version': 100}, format='json')
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertEqual(response.json()['version'], version)
+
+    def test_stale_if_match_conflicts(self):
+        """
+        Правка с устаревшей версией (If-Match или expectedVersion) - 409 без изменений.
+        """
+        path = f'/api/tenders/{self.tender.id}/edit?username={self.owners[0].username}'
+        response = self.client.patch(path, {'name': 'First'}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response['ETag'], '"2"')
+
+        response = self.client.patch(path, {'name': 'Stale'}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 409)
+        response = self.client.patch(f'{path}&expectedVersion=1', {'name': 'Stale'}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.patch(path, {'name': 'Bad'}, format='json', HTTP_IF_MATCH='abc').status_code, 400)
+
+        tender = Tender.objects.get(id=self.tender.id)
+        self.assertEqual((tender.name, tender.version), ('First', 2))
+        response = self.client.patch(path, {'name': 'Second'}, format='json', HTTP_IF_MATCH='W/"2"')
+        self.assertEqual((response.status_code, response.json()['version']), (200, 3))
+
+
+@override_settings(VERSION_SNAPSHOT_INTERVAL=3, VERSION_COMPRESS_MIN_LENGTH=64)
+class VersionHistoryTests(APITestCase):
+
+    def test_restore_from_snapshots_and_deltas(self):
+        """
+        Каждая версия восстанавливается по снимку и дельтам после него,
+        включая длинное описание, сохраненное сжатым.
+        """
+        tender, states = self.tender, {}
+        for version in range(1, 8):
+            tender.name = f'Tender {version}'
+            if version % 2:
+                tender.description = f'Description {version} ' * (version * 4)
+            states[version] = tender_versions.state(tender)
+            tender_versions.record(tender)
+            tender.version += 1
+
+        for version, state in states.items():
+            self.assertEqual(tender_versions.restore(tender.id, version), state)
+        self.assertIsNone(tender_versions.restore(tender.id, 8))
+
+        rows = {row.version: row for row in TenderVersion.objects.filter(tender_id=tender.id)}
+        self.assertEqual([version for version, row in sorted(rows.items()) if row.changed_fields is None], [1, 4, 7])
+        self.assertEqual(rows[2].changed_fields, ['name', 'version'])
+        self.assertIsNone(rows[2].description)
+        self.assertIsNone(rows[5].description)
+        self.assertIsNotNone(rows[5].description_compressed)
+
+
+@postgres_only
+class RollbackTests(APITestCase):
+
+    def edit(self, name):
+        response = self.client.patch(
+            f'/api/tenders/{self.tender.id}/edit?username={self.owners[0].username}', {'name': name}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_rollback_trims_history(self):
+        """
+        Откат к версии 2 возвращает ее параметры и удаляет из истории версии 2 и позже;
+        следующая правка снова пишет историю с версии 2.
+        """
+        for name in ('Second', 'Third', 'Fourth'):
+            self.edit(name)
+        path = f'/api/tenders/{self.tender.id}/rollback/{{}}/?username={self.owners[0].username}'
+
+        response = self.client.put(path.format(2))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.json()['name'], response.json()['version']), ('Second', 2))
+        history = TenderVersion.objects.filter(tender_id=self.tender.id).values_list('version', flat=True)
+        self.assertEqual(sorted(history.all()), [1])
+        self.assertEqual(self.client.put(path.format(3)).status_code, 404)
+
+        self.assertEqual(self.edit('Third again')['version'], 3)
+        self.assertEqual(sorted(history.all()), [1, 2])
+
+
+class RendererTests(TestCase):
+
+    def test_matches_drf_json(self):
+        """
+        ORJSONRenderer/ORJSONParser дают тот же результат, что JSONRenderer/JSONParser,
+        в том числе с отступом из параметра indent типа ответа.
+        """
+        data = {'id': uuid.uuid4(), 'name': 'Тендер\u2028', 'items': [1, 2.5, None], 'at': timezone.now()}
+        for media_type in ('application/json', 'application/json; indent=2', 'application/json; indent=4'):
+            self.assertEqual(
+                ORJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type), media_type,
+            )
+        body = JSONRenderer().render(data)
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        self.assertIs(ORJSONParser.renderer_class, ORJSONRenderer)
+
+
+class ReadViewTests(APITestCase):
+
+    def test_options_and_not_allowed(self):
+        """
+        Читающие endpoints (и async-версии) отвечают на OPTIONS метаданными DRF, на POST - 405.
+        """
+        response = self.client.options('/api/tenders')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('OPTIONS', response['Allow'])
+        self.assertEqual(response.json()['name'], 'Get Tenders')
+
+        response = self.client.post('/api/tenders')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.json(), {'detail': 'Method "POST" not allowed.'})
+
+    def test_async_caller_matches_sync(self):
+        """
+        aload_caller и load_caller строят одного и того же Caller - из БД и из кэша.
+        """
+        for username in (self.owners[0].username, self.stranger.username, 'nobody'):
+            for _ in range(2):
+                caller, acaller = load_caller(username), async_to_sync(aload_caller)(username)
+                self.assertEqual(
+                    (acaller.employee, acaller.organization_ids), (caller.employee, caller.organization_ids),
+                )
+        self.assertEqual(load_caller(self.owners[0].username).organization_ids, {self.organization.id})
+        self.assertIsNone(load_caller('nobody').employee)
+
+
+class ReviewTests(APITestCase):
+
+    def get(self, **params):
+        return self.client.get(f'/api/bids/{self.tender.id}/reviews', {
+            'authorUsername': self.bidder.username, 'requestUsername': self.owners[0].username, **params,
+        })
+
+    def test_embed_and_pagination(self):
+        """
+        embed=bid,reviewer добавляет имя предложения и автора отзыва; limit и offset проверяются.
+        """
+        bid = self.create_bid(name='Reviewed')
+        for owner in self.owners[1:]:
+            Review.objects.create(bid=bid, user=owner, content=f'Review by {owner.username}')
+
+        items = self.get(embed='bid,reviewer', limit=10).json()
+        self.assertEqual(
+            sorted((item['bid_name'], item['reviewer_username'], item['content']) for item in items),
+            [('Reviewed', 'owner2', 'Review by owner2'), ('Reviewed', 'owner3', 'Review by owner3')],
+        )
+        self.assertNotIn('reviewer_username', self.get().json()[0])
+        self.assertEqual(self.get(limit=1, offset=1).json(), self.get(limit=10).json()[1:])
+
+        for params in ({'limit': 'x'}, {'offset': '1.5'}, {'embed': 'author'}):
+            response = self.get(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('reason', response.json())
+
+
+@postgres_only
+class TenderBidStatsTests(APITestCase):
+
+    def test_rebuild_one_tender_counts(self):
+        """
+        Пересчет одного тендера: восстановленная строка - updated, лишняя строка - deleted,
+        строка-заглушка на время пересчета в счетчики не попадает.
+        """
+        self.create_bid()
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM tender_bid_stats WHERE tender_id = %s', [self.tender.id])
+        self.assertEqual(rebuild_tender_bid_stats(self.tender.id), {'updated': 1, 'deleted': 0})
+        self.assertEqual(rebuild_tender_bid_stats(self.tender.id), {'updated': 0, 'deleted': 0})
+
+        empty = Tender.objects.create(
+            name='Empty', service_type='Delivery', status='PUBLISHED', organization=self.organization,
+            creator_username=self.owners[0], created_at=timezone.now(), version=1,
+        )
+        self.assertEqual(rebuild_tender_bid_stats(empty.id), {'updated': 0, 'deleted': 0})
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO tender_bid_stats (tender_id, bids) VALUES (%s, 5)', [empty.id])
+        self.assertEqual(rebuild_tender_bid_stats(empty.id), {'updated': 0, 'deleted': 1})
+        self.assertEqual(rebuild_tender_bid_stats(), {'updated': 0, 'deleted': 0})
+
+
+@postgres_only
+class UpdatedAtTests(APITestCase):
+    """
+    updated_at ставит триггер БД: ответы на запись отдают значение из строки.
+    """
+
+    def assertMatchesRow(self, response, model, serializer):
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        row = serializer(model.objects.get(id=data['id'])).data
+        self.assertIsNotNone(row['updated_at'])
+        self.assertEqual(data['updated_at'], row['updated_at'])
+
+    def test_write_responses(self):
+        tender_path = f'/api/tenders/{self.tender.id}'
+        owner = self.owners[0].username
+        response = self.client.patch(f'{tender_path}/edit?username={owner}', {'name': 'Edited'}, format='json')
+        self.assertMatchesRow(response, Tender, TenderSerializer)
+        response = self.client.patch(
+            f'{tender_path}/edit?username={owner}', {'name': 'Again'}, format='json', HTTP_IF_MATCH='"2"',
+        )
+        self.assertMatchesRow(response, Tender, TenderSerializer)
+        # В истории версии 1 updated_at пустой, после отката - время отката
+        self.assertMatchesRow(self.client.put(f'{tender_path}/rollback/1/?username={owner}'), Tender, TenderSerializer)
+        response = self.client.put(f'{tender_path}/status?username={owner}&status=PUBLISHED')
+        self.assertMatchesRow(response, Tender, TenderSerializer)
+
+        body = {
+            'name': 'Bid', 'description': 'Bid', 'tenderId': self.tender.id,
+            'organizationId': str(self.bidder_organization.id), 'creatorUsername': self.bidder.username,
+        }
+        response = self.client.post('/api/bids/new', body, format='json')
+        self.assertEqual(response.status_code, 201)
+        bid_id = response.json()['id']
+        self.assertIsNotNone(Bid.objects.get(id=bid_id).created_at)
+        response = self.client.patch(
+            f'/api/bids/{bid_id}/edit?username={self.bidder.username}', {'name': 'Edited'}, format='json',
+        )
+        self.assertMatchesRow(response, Bid, BidSerializer)
+        response = self.client.patch(f'/api/bids/submit_decision?bidId={bid_id}&username={owner}&decision=Accept')
+        self.assertMatchesRow(response, Bid, BidSerializer)
+
+
+class ExportTests(APITestCase):
+
+    def export(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).splitlines()
+        return {str(json.loads(line)['id']) for line in lines}
+
+    def test_updated_since(self):
+        """
+        updatedSince отбирает по updated_at, а у ни разу не измененных строк - по created_at.
+        """
+        now = timezone.now()
+        old, day = now - timedelta(days=2), now - timedelta(days=1)
+        stale_tender = Tender.objects.create(
+            name='Stale', service_type='Delivery', status='PUBLISHED', organization=self.organization,
+            creator_username=self.owners[0], created_at=old, version=1,
+        )
+        stale, edited, fresh = self.create_bid(created_at=old), self.create_bid(created_at=old, updated_at=now), self.create_bid()
+
+        self.assertEqual(self.export('/api/tenders/export'), {str(self.tender.id), str(stale_tender.id)})
+        self.assertEqual(self.export('/api/tenders/export', updatedSince=day.isoformat()), {str(self.tender.id)})
+        self.assertEqual(self.export('/api/bids/export'), {str(stale.id), str(edited.id), str(fresh.id)})
+        self.assertEqual(self.export('/api/bids/export', updatedSince=day.isoformat()), {str(edited.id), str(fresh.id)})
+        response = self.client.get('/api/bids/export', {'updatedSince': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bid_visibility(self):
+        """
+        Выгрузка предложений видит то же, что get_bids_for_tender.
+        """
+        draft = self.create_bid(status='CREATED')
+        own = self.create_bid(status='CREATED', creator_username=self.stranger)
+        self.assertEqual(self.export('/api/bids/export', username=self.stranger.username), {str(draft.id), str(own.id)})
+        self.assertEqual(self.export('/api/bids/export', username=self.owners[1].username), {str(draft.id), str(own.id)})
+        self.assertEqual(self.export('/api/bids/export'), set())
+
+
+@postgres_only
+class ChangeFeedTests(APITestCase):
+
+    def changes(self, since):
+        response = self.client.get('/api/changes', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def skip_gap(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval('change_event_seq')")
+            return cursor.fetchone()[0]
+
+    def test_settled_rows(self):
+        rows = [{'seq': 2, 'settled': False}, {'seq': 3, 'settled': False}, {'seq': 5, 'settled': False}]
+        self.assertEqual(settled_rows(1, rows), rows[:2])
+        self.assertEqual(settled_rows(0, rows), [])
+        self.assertEqual(settled_rows(1, rows[:2] + [{'seq': 5, 'settled': True}]), rows[:2] + [{'seq': 5, 'settled': True}])
+
+    @override_settings(CHANGES_GAP_TIMEOUT=0)
+    def test_since_returns_later_events_in_order(self):
+        """
+        Номера событий растут в порядке изменений; since=nextSince отдает только более поздние.
+        """
+        since = self.skip_gap()
+        owner = self.owners[0].username
+        bid = self.create_bid(status='CREATED')
+        self.client.put(f'/api/tenders/{self.tender.id}/status?username={owner}&status=CLOSED')
+        self.client.patch(f'/api/tenders/{self.tender.id}/edit?username={owner}', {'name': 'Edited'}, format='json')
+        self.client.put(f'/api/bids/{bid.id}/status', {'username': self.bidder.username, 'status': 'PUBLISHED'}, format='json')
+
+        feed = self.changes(since)
+        seqs = [item['seq'] for item in feed['items']]
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertEqual(
+            [(item['entity'], item['event'], item['status']) for item in feed['items']],
+            [('tender', 'status', 'CLOSED'), ('tender', 'edited', 'CLOSED'), ('bid', 'status', 'PUBLISHED')],
+        )
+        self.assertEqual(feed['nextSince'], seqs[-1])
+        self.assertEqual(self.changes(feed['nextSince']), {'items': [], 'nextSince': seqs[-1]})
+
+        self.client.put(f'/api/tenders/{self.tender.id}/status?username={owner}&status=PUBLISHED')
+        later = self.changes(feed['nextSince'])
+        self.assertEqual([(item['event'], item['status']) for item in later['items']], [('status', 'PUBLISHED')])
+        self.assertGreater(later['nextSince'], seqs[-1])
+
+    def test_recent_gap_holds_back_later_events(self):
+        """
+        Пропуск номера (транзакция еще не зафиксирована или откачена) задерживает события
+        после него, пока не истечет CHANGES_GAP_TIMEOUT.
+        """
+        since = self.skip_gap()
+        self.skip_gap()
+        self.client.put(f'/api/tenders/{self.tender.id}/status?username={self.owners[0].username}&status=CLOSED')
+        self.assertEqual(self.changes(since), {'items': [], 'nextSince': since})
+        with override_settings(CHANGES_GAP_TIMEOUT=0):
+            self.assertEqual([item['status'] for item in self.changes(since)['items']], ['CLOSED'])
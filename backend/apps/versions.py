@@ -0,0 +1,238 @@
+import zlib
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Bid, BidVersion, Tender, TenderVersion
+
+
+TENDER_FIELDS = (
+    'name',
+    'description',
+    'service_type',
+    'status',
+    'organization_id',
+    'creator_username_id',
+    'created_at',
+    'updated_at',
+    'version',
+)
+
+BID_FIELDS = (
+    'name',
+    'description',
+    'status',
+    'tender_id',
+    'organization_id',
+    'creator_username_id',
+    'created_at',
+    'updated_at',
+    'version',
+    'votes_for',
+)
+
+
+def encode_version(fields, state, previous, snapshot):
+    """
+    Значения столбцов строки истории для состояния state.
+    snapshot - полная копия (changed_fields = NULL), иначе только поля,
+    изменившиеся относительно previous (changed_fields - их список).
+    Длинное описание сжимается zlib в description_compressed.
+    """
+    if snapshot:
+        changed = list(fields)
+        row = dict(state, changed_fields=None)
+    else:
+        changed = [field for field in fields if field == 'version' or state[field] != previous[field]]
+        row = {field: state[field] for field in changed}
+        row['changed_fields'] = changed
+
+    description = row.get('description')
+    if description and len(description) >= settings.VERSION_COMPRESS_MIN_LENGTH:
+        row['description'] = None
+        row['description_compressed'] = zlib.compress(description.encode())
+    return row
+
+
+def decode_rows(fields, rows):
+    """
+    Восстановление состояния по строкам истории от снимка до нужной версии (по возрастанию).
+    """
+    state = {}
+    for row in rows:
+        changed = fields if row['changed_fields'] is None else row['changed_fields']
+        for field in changed:
+            state[field] = row[field]
+        if row.get('description_compressed') is not None and 'description' in changed:
+            state['description'] = zlib.decompress(bytes(row['description_compressed'])).decode()
+    return state
+
+
+class VersionStore:
+    """
+    История версий с периодическими полными снимками и дельтами по полям между ними.
+
+    Каждая версия хранится относительно предыдущей сохраненной: только изменившиеся
+    столбцы, остальные NULL. Каждая VERSION_SNAPSHOT_INTERVAL-я версия (и первая) -
+    полный снимок, поэтому восстановление читает не более интервала строк.
+    Старые строки без changed_fields считаются снимками.
+    """
+
+    def __init__(self, model, target, key, fields):
+        self.model = model
+        self.target = target
+        self.key = key
+        self.fields = fields
+        self.columns = fields + ('changed_fields', 'description_compressed')
+
+    def _history(self, object_id):
+        return self.model.objects.filter(**{self.key: object_id})
+
+    def _rows(self, object_id, version=None):
+        """
+        Строки от последнего снимка до version (или до последней версии) одним запросом.
+        """
+        history = self._history(object_id)
+        if version is not None:
+            history = history.filter(version__lte=version)
+        snapshot = history.filter(changed_fields__isnull=True).order_by('-version').values('version')[:1]
+        return list(
+            history.filter(version__gte=Coalesce(Subquery(snapshot), 0))
+            .order_by('version')
+            .values(*self.columns)
+        )
+
+    def state(self, obj):
+        return {field: getattr(obj, field) for field in self.fields}
+
+    def record(self, obj):
+        """
+        Сохранить текущее состояние obj как версию obj.version перед изменением.
+        """
+        rows = self._rows(obj.pk)
+        previous = decode_rows(self.fields, rows) if rows else None
+        snapshot = (
+            previous is None
+            or obj.version - rows[0]['version'] >= settings.VERSION_SNAPSHOT_INTERVAL
+        )
+        row = encode_version(self.fields, self.state(obj), previous, snapshot)
+        return self.model.objects.create(**{self.key: obj.pk}, **row)
+
+    def restore(self, object_id, version):
+        """
+        Состояние версии version или None, если такой версии нет.
+        """
+        rows = self._rows(object_id, version)
+        if not rows or rows[-1]['version'] != version:
+            return None
+        return decode_rows(self.fields, rows)
+
+    def column_values(self, data):
+        """
+        Значения полей по именам (связи - объектами, как в validated_data) в виде attname -> значение столбца.
+        version задает только VersionStore, она пропускается.
+        """
+        values = {}
+        for name, value in data.items():
+            field = self.target._meta.get_field(name)
+            if field.attname != 'version':
+                values[field.attname] = getattr(value, field.target_field.attname) if field.is_relation and value is not None else value
+        return values
+
+    def write(self, obj, values):
+        """
+        Записать поля values (attname -> значение) и увеличить версию одним UPDATE.
+        updated_at ставит триггер БД (миграция 0010), поэтому он вместе с версией
+        читается из RETURNING - obj после записи совпадает со строкой.
+        """
+        fields = [self.target._meta.get_field(attname) for attname in values]
+        assignments = ''.join(f'{field.column} = %s, ' for field in fields)
+        params = [field.get_db_prep_save(values[field.attname], connection) for field in fields]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {self.target._meta.db_table} SET {assignments}version = version + 1 '
+                f'WHERE id = %s RETURNING version, updated_at',
+                [*params, obj.pk],
+            )
+            obj.version, obj.updated_at = cursor.fetchone()
+        for attname, value in values.items():
+            setattr(obj, attname, value)
+
+    def update(self, object_id, expected_version, changes):
+        """
+        Оптимистичное обновление: только если текущая версия объекта равна expected_version.
+        Сохраняет текущее состояние в истории и одним UPDATE пишет только изменившиеся поля,
+        увеличивая версию.
+        Возвращает обновленный объект или None при конфликте версий.
+        """
+        # Без точки сохранения: вызывающий может дописать событие ленты в ту же транзакцию
+        with transaction.atomic(savepoint=False):
+            obj = (
+                self.target.objects.select_for_update()
+                .filter(pk=object_id, version=expected_version)
+                .first()
+            )
+            if obj is None:
+                return None
+
+            changed = {
+                attname: value for attname, value in self.column_values(changes).items()
+                if getattr(obj, attname) != value
+            }
+            if not changed:
+                return obj
+
+            self.record(obj)
+            self.write(obj, changed)
+        return obj
+
+    def _locked_rows(self, object_id, version):
+        """
+        То же, что _rows(object_id, version), но с блокировкой строки объекта (FOR UPDATE):
+        параллельные правки и откаты того же объекта ждут конца транзакции.
+        """
+        history = self.model._meta.db_table
+        key = self.model._meta.get_field(self.key).column
+        target = self.target._meta.db_table
+        columns = ', '.join(f'h.{self.model._meta.get_field(field).column}' for field in self.columns)
+        sql = (
+            f'SELECT h.id, {columns} FROM {history} h JOIN {target} t ON t.id = h.{key} '
+            f'WHERE h.{key} = %s AND h.version <= %s AND h.version >= COALESCE(('
+            f'SELECT MAX(version) FROM {history} WHERE {key} = %s AND version <= %s AND changed_fields IS NULL'
+            f'), 0) ORDER BY h.version FOR UPDATE OF t'
+        )
+        rows = self.model.objects.raw(sql, [object_id, version, object_id, version])
+        return [{column: getattr(row, column) for column in self.columns} for row in rows]
+
+    def rollback(self, object_id, version):
+        """
+        Откат объекта к версии version с удалением ее и более поздних версий.
+        Два запроса при любой ширине строки: чтение истории с блокировкой объекта
+        и UPDATE объекта вместе с DELETE истории (data-modifying CTE).
+        Возвращает восстановленное состояние или None, если версии нет; updated_at в нем -
+        поставленное триггером при откате (RETURNING), а не из истории.
+        """
+        with transaction.atomic(savepoint=False):
+            rows = self._locked_rows(object_id, version)
+            if not rows or rows[-1]['version'] != version:
+                return None
+            state = decode_rows(self.fields, rows)
+
+            fields = [self.target._meta.get_field(field) for field in self.fields]
+            assignments = ', '.join(f'{field.column} = %s' for field in fields)
+            values = [field.get_db_prep_save(state[field.attname], connection) for field in fields]
+            key = self.model._meta.get_field(self.key).column
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'WITH trimmed AS (DELETE FROM {self.model._meta.db_table} WHERE {key} = %s AND version >= %s) '
+                    f'UPDATE {self.target._meta.db_table} SET {assignments} WHERE id = %s RETURNING updated_at',
+                    [object_id, version, *values, object_id],
+                )
+                state['updated_at'] = cursor.fetchone()[0]
+        return state
+
+
+tender_versions = VersionStore(TenderVersion, Tender, 'tender_id', TENDER_FIELDS)
+bid_versions = VersionStore(BidVersion, Bid, 'bid_id', BID_FIELDS)
@@ -1,15 +1,39 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags
 from .models import Tender, Bid
-from .serializers import TenderSerializer, BidSerializer, ReviewSerializer
+from .serializers import TenderSerializer, TenderEditSerializer, BidSerializer, BidEditSerializer, BidFieldsSerializer, ReviewSerializer
 from rest_framework import status
-from backend.apps.models import Tender, TenderVersion, Bid, BidVersion, Employee, Organization, OrganizationResponsible, Review
-from django.db.models import Q
+from backend.apps.models import Tender, Bid, Employee, Organization, OrganizationResponsible, Review
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Exists, Q, Subquery, UUIDField
 from datetime import datetime
 import pytz
 
+from .pagination import KEYSET_ORDERING, InvalidCursor, keyset_page
+from .permissions import get_caller
+from .readers import RowReader, format_datetime
+from .changes import (
+    EDITED, ROLLED_BACK, STATUS, bid_change, change_params, changes_data, changes_query, record_changes,
+    settled_rows, tender_change,
+)
+from .exports import export_params, export_response, updated_since_filter
+from .bulk import create_bids, create_tenders, parse_int, parse_uuid
+from .renderers import render_json
+from .metrics import REGISTRY as METRICS_REGISTRY, timed_render
+from .versions import bid_versions, tender_versions
+from .cache import MISSING, REGISTRY as CACHE_REGISTRY
+from backend.tenders_app.db.base import POOLS as DB_POOLS
+from .services import (
+    ALREADY_VOTED, APPROVED, BID_NOT_FOUND, BID_SETTLED, DECLINED, TENDER_CLOSED,
+    decide_bid, invalidate_tender_feed, tender_feed_cache, tender_feed_etag, tender_feed_key,
+)
+
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -22,30 +46,214 @@ def ping(request):
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
-def get_tenders(request):
+def ready(request):
     """
-    Получить список тендеров с возможностью фильтрации по типу услуг.
-    Параметры пагинации: limit (ограничение количества) и offset (смещение).
+    Проверка готовности: сервер отвечает и база данных доступна.
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return Response({"reason": "Database is unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response("ok", status=200)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def cache_stats(request):
+    """
+    Счетчики попаданий и промахов двухуровневых кэшей процесса.
+    """
+    return Response({prefix: cache.stats() for prefix, cache in CACHE_REGISTRY.items()}, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def db_pool_stats(request):
+    """
+    Загрузка пулов соединений с БД в текущем процессе (пусто, если пул выключен).
     """
-    service_type = request.GET.get('service_type')
+    return Response({alias: pool.stats() for alias, pool in DB_POOLS.items()}, status=200)
+
+
+class InvalidVersion(ValueError):
+    pass
+
+
+def expected_version(request):
+    """
+    Ожидаемая версия объекта для оптимистичной блокировки: заголовок If-Match
+    ("3", W/"3" или 3) либо параметр expectedVersion. None - проверка не нужна.
+    """
+    value = request.headers.get('If-Match') or request.GET.get('expectedVersion')
+    if not value or value.strip() == '*':
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise InvalidVersion(value)
+
+
+def versioned_response(data):
+    response = Response(data, status=status.HTTP_200_OK)
+    response['ETag'] = f'"{data["version"]}"'
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def metrics(request):
+    """
+    Число SQL-запросов, время в БД, сериализации и ответа по view в формате Prometheus (текущий процесс).
+    """
+    return HttpResponse(METRICS_REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# Быстрое чтение списков в формате TenderSerializer/BidSerializer
+tender_reader = RowReader(TenderSerializer)
+bid_reader = RowReader(BidSerializer)
+
+
+def json_response(data, status=200):
+    with timed_render():
+        body = render_json(data)
+    return HttpResponse(body, content_type='application/json', status=status)
+
+
+def bulk_items(request):
+    """
+    Список объектов из тела массового запроса или None, если тело не подходит.
+    """
+    items = request.data
+    if not isinstance(items, list) or not items or len(items) > settings.BULK_MAX_ITEMS:
+        return None
+    return [item if isinstance(item, dict) else {} for item in items]
+
+
+def bulk_response(created, errors, reader, key):
+    """
+    Результат по каждому объекту в порядке запроса: 201 с созданным объектом или код и причина ошибки.
+    """
+    indexes = [index for index, _ in created]
+    items = [
+        {'index': index, 'status': 201, key: data}
+        for index, data in zip(indexes, reader.read_objects(obj for _, obj in created))
+    ]
+    items = sorted(items + errors, key=lambda item: item['index'])
+    return json_response({'created': len(created), 'failed': len(errors), 'items': items}, status=200)
+
+
+# Виды услуг тендера (tenderServiceType в спецификации)
+SERVICE_TYPES = ['Construction', 'Delivery', 'Manufacture']
+
+
+def tender_feed_params(request):
+    """
+    Нормализованные параметры ленты тендеров (они же - ключ кэша) и текст ошибки или None.
+    """
+    service_types = [
+        value.strip() for raw in request.GET.getlist('service_type') for value in raw.split(',') if value.strip()
+    ]
+    match = request.GET.get('service_type_match', 'exact')
 
     try:
         limit = int(request.GET.get('limit', 5))
         offset = int(request.GET.get('offset', 0))
     except ValueError:
-        return Response({'reason': 'Limit and offset must be integers'}, status=400)
+        return None, 'Limit and offset must be integers'
+
+    if match not in ('exact', 'contains'):
+        return None, "Invalid service_type_match. Valid values are: 'exact', 'contains'"
 
+    if match == 'exact':
+        canonical = {value.lower(): value for value in SERVICE_TYPES}
+        if any(value.lower() not in canonical for value in service_types):
+            return None, f"Invalid service_type. Valid values are: {', '.join(SERVICE_TYPES)}"
+        service_types = sorted({canonical[value.lower()] for value in service_types})
+
+    return {
+        'service_type': service_types,
+        'match': match,
+        'limit': limit,
+        'offset': offset,
+        'cursor': request.GET.get('cursor'),
+    }, None
+
+
+def tender_feed_queryset(params):
     # Базовый запрос: все тендеры со статусом "PUBLISHED"
     tenders = Tender.objects.filter(status="PUBLISHED")
 
-    # Фильтрация по типу услуг, если параметр указан
-    if service_type:
-        tenders = tenders.filter(service_type__icontains=service_type)
+    # Фильтрация по типу услуг, если параметр указан:
+    # service_type IN (...) по частичному индексу (service_type, name) WHERE status='PUBLISHED'
+    service_types = params['service_type']
+    if service_types and params['match'] == 'exact':
+        tenders = tenders.filter(service_type__in=service_types)
+    elif service_types:
+        contains = Q()
+        for value in service_types:
+            contains |= Q(service_type__icontains=value)
+        tenders = tenders.filter(contains)
+    return tenders
 
-    tenders = tenders.distinct()[offset:offset+limit]
 
-    serializer = TenderSerializer(tenders, many=True)
-    return Response(serializer.data, status=200)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_tenders(request):
+    """
+    Получить список тендеров с возможностью фильтрации по типу услуг.
+    service_type - один или несколько видов услуг (service_type=A&service_type=B или A,B), точное совпадение.
+    service_type_match=contains - поиск по подстроке (триграммный индекс) вместо точного совпадения.
+    Параметры пагинации: limit (ограничение количества) и offset (смещение),
+    либо cursor (пустой для первой страницы) - тогда ответ {"items", "nextCursor"}.
+    С TENDER_FEED_CACHE ответ кэшируется до следующего изменения тендеров,
+    If-None-Match -> 304 без запросов к БД.
+    """
+    params, reason = tender_feed_params(request)
+    if reason:
+        return Response({'reason': reason}, status=400)
+
+    key = tender_feed_key(params)
+    cached = MISSING
+    if settings.TENDER_FEED_CACHE:
+        # Одно поколение на запрос: по нему ETag, чтение и запись кэша
+        generation = tender_feed_cache.generation()
+        etag = tender_feed_etag(key, generation)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+        cached = tender_feed_cache.get(key, generation)
+
+    if cached is MISSING:
+        tenders = tender_feed_queryset(params)
+        if params['cursor'] is not None:
+            try:
+                page, next_cursor = keyset_page(tender_reader.values(tenders), params['cursor'], params['limit'])
+            except InvalidCursor:
+                return Response({'reason': 'Invalid cursor'}, status=400)
+            data = {'items': tender_reader.read(page), 'nextCursor': next_cursor}
+        else:
+            offset, limit = params['offset'], params['limit']
+            tenders = tender_reader.values(tenders.order_by(*KEYSET_ORDERING)[offset:offset+limit])
+            data = tender_reader.read(tenders)
+
+        # Last-Modified - время последнего изменения тендеров (без кэша ленты не отдается)
+        last_modified = http_date(tender_feed_cache.changed_at()) if settings.TENDER_FEED_CACHE else None
+        with timed_render():
+            cached = (render_json(data), last_modified)
+        if settings.TENDER_FEED_CACHE:
+            tender_feed_cache.set(key, cached, generation)
+
+    body, last_modified = cached
+    response = HttpResponse(body, content_type='application/json', status=200)
+    if settings.TENDER_FEED_CACHE:
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+    return response
 
 
 
@@ -63,9 +271,8 @@ def create_tender(request):
         return Response({"reason": "Missing required fields: 'creatorUsername' and/or 'organizationId'."}, status=status.HTTP_400_BAD_REQUEST)
     
     # Проверка существования пользователя
-    try:
-        creator = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "Creator with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
     
     # Проверка существования организации
@@ -75,12 +282,7 @@ def create_tender(request):
         return Response({"reason": "Organization with the specified ID does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
     # Проверка, является ли пользователь ответственным за организацию
-    is_responsible = OrganizationResponsible.objects.filter(
-        organization=organization, 
-        user=creator
-    ).exists()
-
-    if not is_responsible:
+    if not caller.is_responsible(organization.id):
         return Response({"reason": "Creator is not responsible for the organization."}, status=status.HTTP_403_FORBIDDEN)
 
     data = request.data.copy()
@@ -95,27 +297,45 @@ def create_tender(request):
     serializer = TenderSerializer(data=data)
     if serializer.is_valid():
         serializer.save()
+        invalidate_tender_feed()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def create_tenders_bulk(request):
+    """
+    Массовое создание тендеров: тело - массив объектов в формате create_tender.
+    Ошибка в одном объекте не отменяет создание остальных, результат - по каждому объекту.
+    """
+    items = bulk_items(request)
+    if items is None:
+        return Response({"reason": f"Request body must be a non-empty array of at most {settings.BULK_MAX_ITEMS} tenders."}, status=status.HTTP_400_BAD_REQUEST)
+
+    created, errors = create_tenders(items)
+    if created:
+        invalidate_tender_feed()
+    return bulk_response(created, errors, tender_reader, 'tender')
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_user_tenders(request):
     """
-    Получение списка тендеров для указанного пользователя по username с поддержкой пагинации (limit и offset).
+    Получение списка тендеров для указанного пользователя по username с поддержкой пагинации (limit и offset или cursor).
     """
     username = request.GET.get('username')
     limit = request.GET.get('limit', 5)
     offset = request.GET.get('offset', 0)
+    cursor = request.GET.get('cursor')
     
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
     
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
     try:
@@ -127,11 +347,17 @@ def get_user_tenders(request):
     # Получение всех тендеров пользователя
     tenders = Tender.objects.filter(creator_username=username)
 
-    tenders = tenders[offset:offset + limit]
-    
-    serializer = TenderSerializer(tenders, many=True)
-    
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    if cursor is not None:
+        try:
+            page, next_cursor = keyset_page(tender_reader.values(tenders), cursor, limit)
+        except InvalidCursor:
+            return Response({"reason": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response({"items": tender_reader.read(page), "nextCursor": next_cursor}, status=status.HTTP_200_OK)
+
+    # Строки читаются одним запросом, без сериализатора (creator_username - без запроса на строку)
+    tenders = tender_reader.values(tenders.order_by(*KEYSET_ORDERING)[offset:offset + limit])
+
+    return json_response(tender_reader.read(tenders), status=status.HTTP_200_OK)
 
 
 
@@ -155,16 +381,12 @@ def tender_status(request, tender_id):
     except Tender.DoesNotExist:
         return Response({"reason": "Tender with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
     # Проверка, является ли пользователь ответственным за организацию тендера
-    responsible = OrganizationResponsible.objects.filter(
-        organization=tender.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(tender.organization_id)
 
     # Обработка GET-запроса
     if request.method == "GET":
@@ -181,12 +403,17 @@ def tender_status(request, tender_id):
         if new_status not in valid_statuses:
             return Response({"reason": f"Invalid status. Valid statuses are: {', '.join(valid_statuses)}."}, status=status.HTTP_400_BAD_REQUEST)
         
-        if not responsible and user.username != tender.creator_username:
+        if not responsible and caller.username != tender.creator_username_id:
             return Response({"reason": "User is not authorized to update the status of this tender."}, status=status.HTTP_403_FORBIDDEN)
         
         # Обновляем статус
         tender.status = new_status
-        tender.save()
+        with transaction.atomic():
+            tender.save()
+            # updated_at ставит триггер БД (миграция 0010): в ответе - значение из строки
+            tender.refresh_from_db(fields=['updated_at'])
+            record_changes([tender_change(tender, STATUS)])
+        invalidate_tender_feed()
 
         serializer = TenderSerializer(tender)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -196,44 +423,53 @@ def tender_status(request, tender_id):
 @permission_classes([AllowAny])
 def edit_tender(request, tender_id):
     """
-    Редактирование существующего тендера
+    Редактирование существующего тендера.
+    С If-Match или expectedVersion изменение применяется только к этой версии тендера, иначе 409.
     """
     username = request.GET.get('username')
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
     
     tender = get_object_or_404(Tender, id=tender_id)
     
-    responsible = OrganizationResponsible.objects.filter(
-        organization=tender.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(tender.organization_id)
 
     if not responsible:
         return Response({"reason": "User is not authorized to update the status of this tender."}, status=status.HTTP_403_FORBIDDEN)
 
-    serializer = TenderSerializer(tender, data=request.data, partial=True)
+    try:
+        expected = expected_version(request)
+    except InvalidVersion:
+        return Response({"reason": "Invalid expected version."}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = TenderEditSerializer(tender, data=request.data, partial=True)
+    if serializer.is_valid() and expected is not None:
+        # Условное обновление: конфликт, если тендер уже изменили после чтения клиентом
+        with transaction.atomic():
+            tender = tender_versions.update(tender.id, expected, serializer.validated_data)
+            if tender is None:
+                return Response({"reason": "Tender version conflict."}, status=status.HTTP_409_CONFLICT)
+            if tender.version != expected:
+                record_changes([tender_change(tender, EDITED)])
+        invalidate_tender_feed()
+        return versioned_response(TenderSerializer(tender).data)
+
     if serializer.is_valid():
-        TenderVersion.objects.create(
-            tender_id=tender.id,
-            name=tender.name,
-            description=tender.description,
-            service_type=tender.service_type,
-            status=tender.status,
-            organization_id=tender.organization.id,
-            creator_username=tender.creator_username,
-            created_at=tender.created_at,
-            updated_at=tender.updated_at,
-            version=tender.version
-        )
-        tender.version += 1
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            # Строка блокируется до записи истории: параллельные правки и откаты тендера ждут,
+            # версия берется из заблокированной строки
+            tender = get_object_or_404(
+                Tender.objects.select_related('creator_username').select_for_update(of=('self',)), id=tender.id,
+            )
+            tender_versions.record(tender)
+            tender_versions.write(tender, tender_versions.column_values(serializer.validated_data))
+            record_changes([tender_change(tender, EDITED)])
+        invalidate_tender_feed()
+        return Response(TenderSerializer(tender).data, status=status.HTTP_200_OK)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -248,39 +484,27 @@ def rollback_tender_version(request, tender_id, version):
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
     tender = get_object_or_404(Tender, id=tender_id)
 
-    responsible = OrganizationResponsible.objects.filter(
-        organization=tender.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(tender.organization_id)
 
     if not responsible:
         return Response({"reason": "User is not authorized to update the status of this tender."}, status=status.HTTP_403_FORBIDDEN)
 
-    try:
-        tender_version = TenderVersion.objects.get(tender_id=tender_id, version=version)
-    except TenderVersion.DoesNotExist:
-        return Response({"reason": "Tender version with the specified version does not exist."}, status=status.HTTP_404_NOT_FOUND)
-
-    tender.name = tender_version.name
-    tender.description = tender_version.description
-    tender.service_type = tender_version.service_type
-    tender.status = tender_version.status
-    tender.organization = tender_version.organization
-    tender.creator_username = tender_version.creator_username
-    tender.created_at = tender_version.created_at
-    tender.updated_at = tender_version.updated_at
-    tender.version = tender_version.version
-    tender.save()
-
-    # Удаление версии и всех более поздних версий
-    TenderVersion.objects.filter(tender_id=tender_id, version__gte=version).delete()
+    # Обновление тендера и удаление версии и всех более поздних версий в одной транзакции
+    with transaction.atomic():
+        tender_version = tender_versions.rollback(tender_id, version)
+        if tender_version is None:
+            return Response({"reason": "Tender version with the specified version does not exist."}, status=status.HTTP_404_NOT_FOUND)
+
+        for field, value in tender_version.items():
+            setattr(tender, field, value)
+        record_changes([tender_change(tender, ROLLED_BACK)])
+    invalidate_tender_feed()
 
     serializer = TenderSerializer(tender)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -303,54 +527,64 @@ def create_bid(request):
         return Response({"reason": "Missing required fields: 'name', 'tenderId', 'organizationId', and/or 'creatorUsername'."}, status=status.HTTP_400_BAD_REQUEST)
 
     # Проверка существования создателя
-    try:
-        creator = Employee.objects.get(username=creator_username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, creator_username)
+    if caller.employee is None:
         return Response({"reason": "Creator with the specified username does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Проверка существования тендера
-    try:
-        tender = Tender.objects.get(id=tender_id)
-    except Tender.DoesNotExist:
+    # Проверка существования тендера и организации одним запросом
+    organization_id = parse_uuid(organization_id)
+    tender = (
+        Tender.objects.filter(id=parse_int(tender_id))
+        .annotate(organization_exists=Exists(Organization.objects.filter(id=organization_id)))
+        .first()
+    )
+    if tender is None:
         return Response({"reason": "Tender with the specified ID does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Проверка существования организации
-    try:
-        organization = Organization.objects.get(id=organization_id)
-    except Organization.DoesNotExist:
+    if not tender.organization_exists:
         return Response({"reason": "Organization with the specified ID does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
-    tender_organization = Organization.objects.get(id=tender.organization.id)
-
     # Проверка, является ли создатель ответственным за организацию, связанную с тендером
-    is_responsible = OrganizationResponsible.objects.filter(
-        organization=tender_organization,
-        user=creator
-    ).exists()
+    is_responsible = caller.is_responsible(tender.organization_id)
 
     if is_responsible:
         return Response({"reason": "Creator cannot make bids for the organization related to the tender."}, status=status.HTTP_403_FORBIDDEN)
 
-    # Создание нового предложения
-    data = {
-        'name': name,
-        'description': description,
-        'status': "CREATED",
-        'tender': tender_id,
-        'organization': organization_id,
-        'creator_username': creator_username,
-        'version': 1,
-        'votes_for': 0
-    }
-    
-    serializer = BidSerializer(data=data)
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    # Создание нового предложения: связи берутся из уже загруженных объектов, без повторных запросов
+    serializer = BidFieldsSerializer(data={'name': name, 'description': description})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    bid = Bid(
+        **serializer.validated_data,
+        status="CREATED",
+        tender=tender,
+        organization_id=organization_id,
+        creator_username=caller.employee,
+        # Как в create_bids: без created_at предложение не попало бы в выгрузку с updatedSince
+        created_at=timezone.now(),
+        version=1,
+        votes_for=0,
+    )
+    bid.save(force_insert=True)
+    return Response(BidSerializer(bid).data, status=status.HTTP_201_CREATED)
 
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def create_bids_bulk(request):
+    """
+    Массовое создание предложений: тело - массив объектов в формате create_bid.
+    Ошибка в одном объекте не отменяет создание остальных, результат - по каждому объекту.
+    """
+    items = bulk_items(request)
+    if items is None:
+        return Response({"reason": f"Request body must be a non-empty array of at most {settings.BULK_MAX_ITEMS} bids."}, status=status.HTTP_400_BAD_REQUEST)
+
+    created, errors = create_bids(items)
+    return bulk_response(created, errors, bid_reader, 'bid')
+
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -363,15 +597,32 @@ def get_user_bids(request):
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
     
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
-    bids = Bid.objects.filter(creator_username=username)
-    serializer = BidSerializer(bids, many=True)
+    bids = bid_reader.values(Bid.objects.filter(creator_username=username))
     
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return json_response(bid_reader.read(bids), status=status.HTTP_200_OK)
+
+
+def visible_bids(tender_id, username=None):
+    """
+    Предложения тендера, видимые пользователю, одним предикатом: опубликованные либо все,
+    если пользователь - автор предложения по тендеру или ответственный за организацию тендера
+    (проверяются все его организации). Оба EXISTS не зависят от строки bid, PostgreSQL
+    вычисляет их один раз на запрос.
+    """
+    bids = Bid.objects.filter(tender_id=tender_id)
+    if not username:
+        return bids.filter(status='PUBLISHED')
+
+    is_author = Exists(Bid.objects.filter(tender_id=tender_id, creator_username=username))
+    is_responsible = Exists(OrganizationResponsible.objects.filter(
+        organization_id__in=Tender.objects.filter(id=tender_id).values('organization_id'),
+        user__username=username,
+    ))
+    return bids.filter(Q(status='PUBLISHED') | is_author | is_responsible)
 
 
 @api_view(["GET"])
@@ -379,13 +630,14 @@ def get_user_bids(request):
 def get_bids_for_tender(request, tender_id):
     """
     Получить список предложений для указанного тендера в зависимости от статуса и прав доступа
-    с поддержкой пагинации через limit и offset.
+    с поддержкой пагинации через limit и offset или cursor.
+    Права проверяются в том же запросе, что и выборка (visible_bids); существование тендера -
+    только если страница пуста.
     """
-    tender = get_object_or_404(Tender, id=tender_id)
-    
     username = request.GET.get('username')
     limit = request.GET.get('limit', 5)
     offset = request.GET.get('offset', 0)
+    cursor = request.GET.get('cursor')
 
     try:
         limit = int(limit)
@@ -394,27 +646,130 @@ def get_bids_for_tender(request, tender_id):
         return Response({"reason": "Limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
 
     if username:
-        try:
-            user = Employee.objects.get(username=username)
-        except Employee.DoesNotExist:
+        caller = get_caller(request, username)
+        if caller.employee is None:
             return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        is_author = Bid.objects.filter(tender=tender, creator_username=username).exists()
-        user_organization = OrganizationResponsible.objects.filter(user=user).first()
-        is_responsible = user_organization and user_organization.organization == tender.organization
+    bids = visible_bids(tender_id, username)
 
-        if is_author or is_responsible:
-            bids = Bid.objects.filter(tender=tender)
-        else:
-            bids = Bid.objects.filter(tender=tender, status='PUBLISHED')
+    if cursor is not None:
+        try:
+            page, next_cursor = keyset_page(bid_reader.values(bids), cursor, limit)
+        except InvalidCursor:
+            return Response({"reason": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        data = {"items": bid_reader.read(page), "nextCursor": next_cursor}
     else:
-        bids = Bid.objects.filter(tender=tender, status='PUBLISHED')
+        page = list(bid_reader.values(bids.order_by(*KEYSET_ORDERING)[offset:offset + limit]))
+        data = bid_reader.read(page)
 
-    paginated_bids = bids[offset:offset + limit]
+    if not page and not Tender.objects.filter(id=tender_id).exists():
+        return Response({"detail": "No Tender matches the given query."}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = BidSerializer(paginated_bids, many=True)
-    
-    return Response(serializer.data, status=200)
+    return json_response(data, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def export_tenders(request):
+    """
+    Потоковая выгрузка всех видимых тендеров: опубликованных, а с username - еще и всех
+    тендеров организаций пользователя. exportFormat=ndjson (по умолчанию) или csv,
+    updatedSince - только измененные с указанного времени.
+    """
+    export_format, updated_since, reason = export_params(request)
+    if reason:
+        return Response({"reason": reason}, status=status.HTTP_400_BAD_REQUEST)
+
+    tenders = Tender.objects.filter(status='PUBLISHED')
+    username = request.GET.get('username')
+    if username:
+        caller = get_caller(request, username)
+        if caller.employee is None:
+            return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
+        tenders = Tender.objects.filter(Q(status='PUBLISHED') | Q(organization_id__in=caller.organization_ids))
+
+    tenders = updated_since_filter(tenders, updated_since)
+    return export_response(request, tender_reader, tenders, export_format, 'tenders')
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def export_bids(request):
+    """
+    Потоковая выгрузка всех видимых предложений по правилу visible_bids: опубликованные,
+    а с username - еще и все предложения по тендерам, где пользователь автор предложения
+    или ответственный за организацию тендера.
+    exportFormat=ndjson (по умолчанию) или csv, updatedSince - только измененные с указанного времени.
+    """
+    export_format, updated_since, reason = export_params(request)
+    if reason:
+        return Response({"reason": reason}, status=status.HTTP_400_BAD_REQUEST)
+
+    bids = Bid.objects.filter(status='PUBLISHED')
+    username = request.GET.get('username')
+    if username:
+        caller = get_caller(request, username)
+        if caller.employee is None:
+            return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
+        bids = Bid.objects.filter(
+            Q(status='PUBLISHED')
+            | Q(tender_id__in=Bid.objects.filter(creator_username=username).values('tender_id'))
+            | Q(tender__organization_id__in=caller.organization_ids)
+        )
+
+    bids = updated_since_filter(bids, updated_since)
+    return export_response(request, bid_reader, bids, export_format, 'bids')
+
+
+# Счетчики сводки tender_bid_stats по статусам предложений
+BID_STATS_STATUSES = (
+    ('CREATED', 'created'),
+    ('PUBLISHED', 'published'),
+    ('CANCELED', 'canceled'),
+    ('APPROVED', 'approved'),
+)
+
+
+def bid_stats_data(tender_id, row):
+    """
+    Ответ get_bid_stats по строке Tender LEFT JOIN tender_bid_stats; нет строки сводки - нет предложений.
+    """
+    return {
+        "tender_id": tender_id,
+        "bids": row['bid_stats__bids'] or 0,
+        "statuses": {name: row[f'bid_stats__{column}'] or 0 for name, column in BID_STATS_STATUSES},
+        "votes_for": row['bid_stats__votes_for'] or 0,
+        "last_bid_at": format_datetime(row['bid_stats__last_bid_at'], timezone.get_current_timezone()),
+    }
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_bid_stats(request, tender_id):
+    """
+    Сводка по предложениям тендера: число по статусам, сумма votes_for и время последнего предложения.
+    Читается одной строкой из tender_bid_stats, без просмотра предложений. Доступна ответственным
+    за организацию тендера.
+    """
+    username = request.GET.get('username')
+    if not username:
+        return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+    caller = get_caller(request, username)
+    if caller.employee is None:
+        return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
+
+    row = Tender.objects.filter(id=tender_id).values(
+        'organization_id', 'bid_stats__bids', 'bid_stats__votes_for', 'bid_stats__last_bid_at',
+        *(f'bid_stats__{column}' for _, column in BID_STATS_STATUSES),
+    ).first()
+    if row is None:
+        return Response({"reason": "Tender with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
+
+    if not caller.is_responsible(row['organization_id']):
+        return Response({"reason": "User is not authorized to view bid statistics for this tender."}, status=status.HTTP_403_FORBIDDEN)
+
+    return json_response(bid_stats_data(tender_id, row), status=200)
 
 
 
@@ -436,17 +791,13 @@ def bid_status(request, bid_id):
     except Bid.DoesNotExist:
         return Response({"reason": "Bid with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
 
-    responsible = OrganizationResponsible.objects.filter(
-        organization=bid.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(bid.organization_id)
 
-    author = (user.username == bid.creator_username)
+    author = (caller.username == bid.creator_username_id)
 
     # GET-запрос: возвращаем текущий статус предложения
     if request.method == "GET":
@@ -471,7 +822,11 @@ def bid_status(request, bid_id):
 
         if bid.status != "CANCELED":
             bid.status = new_status
-            bid.save()
+            with transaction.atomic():
+                bid.save()
+                # updated_at ставит триггер БД (миграция 0010): в ответе - значение из строки
+                bid.refresh_from_db(fields=['updated_at'])
+                record_changes([bid_change(bid, STATUS)])
         else:
             return Response({"reason": "You can't edit a canceled bid."}, status=status.HTTP_403_FORBIDDEN)
         
@@ -505,9 +860,8 @@ def submit_decision(request):
     except Bid.DoesNotExist:
         return Response({"reason": "Bid with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
     
     try:
@@ -515,34 +869,27 @@ def submit_decision(request):
     except Tender.DoesNotExist:
         return Response({"reason": "Tender with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
 
-    responsible = OrganizationResponsible.objects.filter(
-        organization=tender.organization,
-        user=user
-    ).exists()
-    
-    author = (user == bid.creator_username)
-
-    if not responsible and not author:
+    # Решение (и голос в кворуме) - только от ответственных; автор предложения за него не голосует
+    if not caller.is_responsible(tender.organization_id):
         return Response({"reason": "User is not authorized to update the status of this bid."}, status=status.HTTP_403_FORBIDDEN)
-    
-    # Проверка, голосовал ли пользователь ранее
-    if bid.voters.filter(id=user.id).exists():
-        return Response({"reason": "User has already voted on this bid."}, status=status.HTTP_403_FORBIDDEN)
 
-    # Обновление статуса предложения
-    if decision == "Accept":
-        bid.votes_for += 1
-        bid.voters.add(user)
-        bid.save()
+    outcome, votes_for, updated_at = decide_bid(bid.id, tender.organization_id, caller.employee.id, decision)
 
-        if bid.votes_for >= 3:
-            tender.status = "CLOSED"  # Закрываем тендер
-            tender.save()
-    else:
-        bid.status = "CANCELED"
-        bid.save()
+    if outcome == BID_NOT_FOUND:
+        return Response({"reason": "Bid with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
+    if outcome == ALREADY_VOTED:
+        return Response({"reason": "User has already voted on this bid."}, status=status.HTTP_403_FORBIDDEN)
+    if outcome == TENDER_CLOSED:
+        return Response({"reason": "Tender is already closed."}, status=status.HTTP_403_FORBIDDEN)
+    if outcome == BID_SETTLED:
+        return Response({"reason": "Decision on this bid has already been made."}, status=status.HTTP_403_FORBIDDEN)
+    if outcome == DECLINED:
         return Response("That bid has been declined", status=status.HTTP_200_OK)
 
+    bid.votes_for, bid.updated_at = votes_for, updated_at
+    if outcome == APPROVED:
+        bid.status = "APPROVED"
+
     serializer = BidSerializer(bid)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -551,48 +898,53 @@ def submit_decision(request):
 @permission_classes([AllowAny])
 def edit_bid(request, bid_id):
     """
-    Редактирование предложения
+    Редактирование предложения.
+    С If-Match или expectedVersion изменение применяется только к этой версии предложения, иначе 409.
     """
     username = request.GET.get('username')
     bid = get_object_or_404(Bid, id=bid_id)
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_404_NOT_FOUND)
     
-    responsible = OrganizationResponsible.objects.filter(
-        organization=bid.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(bid.organization_id)
 
-    author = (user == bid.creator_username)
+    author = (caller.username == bid.creator_username_id)
 
     if not responsible and not author:
         return Response({"reason": "User is not authorized to update the status of this bid."}, status=status.HTTP_403_FORBIDDEN)
 
-    serializer = BidSerializer(bid, data=request.data, partial=True)
+    try:
+        expected = expected_version(request)
+    except InvalidVersion:
+        return Response({"reason": "Invalid expected version."}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = BidEditSerializer(bid, data=request.data, partial=True)
+
+    if serializer.is_valid() and expected is not None:
+        # Условное обновление: конфликт, если предложение уже изменили после чтения клиентом
+        with transaction.atomic():
+            bid = bid_versions.update(bid.id, expected, serializer.validated_data)
+            if bid is None:
+                return Response({"reason": "Bid version conflict."}, status=status.HTTP_409_CONFLICT)
+            if bid.version != expected:
+                record_changes([bid_change(bid, EDITED)])
+        return versioned_response(BidSerializer(bid).data)
 
     if serializer.is_valid():
-        # Сохранение текущей версии предложения в таблице версий перед изменением
-        BidVersion.objects.create(
-            bid_id=bid.id,
-            name=bid.name,
-            description=bid.description,
-            status=bid.status,
-            tender_id=bid.tender.id,
-            organization_id=bid.organization.id,
-            creator_username=bid.creator_username,
-            created_at=bid.created_at,
-            updated_at=bid.updated_at,
-            version=bid.version,
-            votes_for=bid.votes_for,
-        )
-        bid.version += 1
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Сохранение текущей версии предложения в истории версий перед изменением;
+        # строка заблокирована, как в edit_tender
+        with transaction.atomic():
+            bid = get_object_or_404(
+                Bid.objects.select_related('creator_username').select_for_update(of=('self',)), id=bid.id,
+            )
+            bid_versions.record(bid)
+            bid_versions.write(bid, bid_versions.column_values(serializer.validated_data))
+            record_changes([bid_change(bid, EDITED)])
+        return Response(BidSerializer(bid).data, status=status.HTTP_200_OK)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -609,9 +961,8 @@ def rollback_bid_version(request, bid_id, version):
     if not username:
         return Response({"reason": "Username is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_404_NOT_FOUND)
     
     try:
@@ -619,36 +970,23 @@ def rollback_bid_version(request, bid_id, version):
     except Bid.DoesNotExist:
         return Response({"reason": "Bid with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
 
-    responsible = OrganizationResponsible.objects.filter(
-        organization=bid.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(bid.organization_id)
     
-    author = (user == bid.creator_username)
+    author = (caller.username == bid.creator_username_id)
 
     if not responsible and not author:
         return Response({"reason": "User is not authorized to update or rollback the status of this bid."}, status=status.HTTP_403_FORBIDDEN)
     
-    try:
-        bid_version = BidVersion.objects.get(bid_id=bid_id, version=version)
-    except BidVersion.DoesNotExist:
-        return Response({"reason": "Bid version with the specified version does not exist."}, status=status.HTTP_404_NOT_FOUND)
-    
-    # Обновление текущего предложения данными из указанной версии
-    bid.name = bid_version.name
-    bid.description = bid_version.description
-    bid.status = bid_version.status
-    bid.tender = bid_version.tender
-    bid.organization = bid_version.organization
-    bid.creator_username = bid_version.creator_username
-    bid.created_at = bid_version.created_at
-    bid.updated_at = bid_version.updated_at
-    bid.version = bid_version.version
-    bid.votes_for = bid_version.votes_for
-    bid.save()
-
-    # Удаление всех версий, которые равны или превышают текущую откатываемую версию
-    BidVersion.objects.filter(bid_id=bid_id, version__gte=version).delete()
+    # Обновление предложения данными из указанной версии и удаление всех версий,
+    # которые равны или превышают откатываемую, в одной транзакции
+    with transaction.atomic():
+        bid_version = bid_versions.rollback(bid_id, version)
+        if bid_version is None:
+            return Response({"reason": "Bid version with the specified version does not exist."}, status=status.HTTP_404_NOT_FOUND)
+
+        for field, value in bid_version.items():
+            setattr(bid, field, value)
+        record_changes([bid_change(bid, ROLLED_BACK)])
 
     serializer = BidSerializer(bid)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -666,24 +1004,20 @@ def create_review(request, bid_id):
     if not username or not content:
         return Response({"reason": "Username and content are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=username)
-    except Employee.DoesNotExist:
+    caller = get_caller(request, username)
+    if caller.employee is None:
         return Response({"reason": "User with the specified username does not exist."}, status=status.HTTP_404_NOT_FOUND)
 
     bid = get_object_or_404(Bid, id=bid_id)
     
-    responsible = OrganizationResponsible.objects.filter(
-        organization=bid.organization,
-        user=user
-    ).exists()
+    responsible = caller.is_responsible(bid.organization_id)
 
     if not responsible:
         return Response({"reason": "User is not authorized to leave a review for this bid."}, status=status.HTTP_403_FORBIDDEN)
 
     review = Review.objects.create(
         bid=bid,
-        user=user,
+        user=caller.employee,
         content=content
     )
 
@@ -691,50 +1025,117 @@ def create_review(request, bid_id):
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+# Поля, которые можно встроить в отзыв параметром embed: имя -> [(поле ответа, столбец через JOIN)]
+REVIEW_EMBEDS = {
+    'bid': [('bid_name', 'bid__name')],
+    # Автор отзыва (review.user); authorUsername запроса - автор предложений, не отзыва
+    'reviewer': [('reviewer_username', 'user__username')],
+}
+
+review_reader = RowReader(ReviewSerializer)
+
+
+def review_embeds(request):
+    """
+    Встраиваемые поля из embed (embed=bid,reviewer или embed=bid&embed=reviewer) и текст ошибки или None.
+    """
+    names = {value.strip() for raw in request.GET.getlist('embed') for value in raw.split(',') if value.strip()}
+    if names - set(REVIEW_EMBEDS):
+        return None, f"Invalid embed. Valid values are: {', '.join(REVIEW_EMBEDS)}"
+    return [field for name in REVIEW_EMBEDS if name in names for field in REVIEW_EMBEDS[name]], None
+
+
+def review_access_query(tender_id, author_username):
+    """
+    Проверки get_reviews одним запросом: строка есть, только если автор существует;
+    в ней - существует ли тендер и его организация.
+    """
+    tenders = Tender.objects.filter(id=tender_id)
+    return Employee.objects.filter(username=author_username).annotate(
+        tender_exists=Exists(tenders),
+        tender_organization_id=Subquery(tenders.values('organization_id')[:1], output_field=UUIDField()),
+    ).values('tender_exists', 'tender_organization_id')
+
+
+def reviews_query(tender_id, author_username, reader):
+    """
+    Отзывы на предложения автора по тендеру: review JOIN bid (+ employee для author),
+    порядок (created_at, id) по индексу review (bid_id, created_at, id).
+    """
+    reviews = Review.objects.filter(bid__tender_id=tender_id, bid__creator_username=author_username)
+    return reader.values(reviews.order_by(*KEYSET_ORDERING))
+
+
+def review_access_error(access, caller):
+    """
+    (тело, код) ошибки доступа к отзывам в прежнем порядке проверок или None.
+    """
+    if access is None:
+        return {"reason": "Author with the specified username does not exist."}, status.HTTP_401_UNAUTHORIZED
+    if caller.employee is None:
+        return {"reason": "Request User with the specified username does not exist."}, status.HTTP_401_UNAUTHORIZED
+    if not access['tender_exists']:
+        return {"reason": "Tender with the specified ID does not exist."}, status.HTTP_404_NOT_FOUND
+    if not caller.is_responsible(access['tender_organization_id']):
+        return {"reason": "User is not authorized to view reviews for this tender."}, status.HTTP_403_FORBIDDEN
+    return None
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_reviews(request, tender_id):
     """
     Просмотр отзывов на предложения автора.
+    Пагинация: limit и offset или cursor (ответ {"items", "nextCursor"}).
+    embed=bid,reviewer - добавить в каждый отзыв bid_name и reviewer_username (автор отзыва).
     """
     author_username = request.GET.get('authorUsername')
     request_username = request.GET.get('requestUsername')
+    cursor = request.GET.get('cursor')
 
-    limit = int(request.GET.get('limit', 5))
-    offset = int(request.GET.get('offset', 0))
+    try:
+        limit = int(request.GET.get('limit', 5))
+        offset = int(request.GET.get('offset', 0))
+    except ValueError:
+        return Response({"reason": "Limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
 
     if not author_username or not request_username:
         return Response({"reason": "username are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        author = Employee.objects.get(username=author_username)
-    except Employee.DoesNotExist:
-        return Response({"reason": "Author with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
+    embeds, reason = review_embeds(request)
+    if reason:
+        return Response({"reason": reason}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        user = Employee.objects.get(username=request_username)
-    except Employee.DoesNotExist:
-        return Response({"reason": "Request User with the specified username does not exist."}, status=status.HTTP_401_UNAUTHORIZED)
+    caller = get_caller(request, request_username)
+    error = review_access_error(review_access_query(tender_id, author_username).first(), caller)
+    if error:
+        return Response(error[0], status=error[1])
 
-    try:
-        tender = Tender.objects.get(id=tender_id)
-    except Tender.DoesNotExist:
-        return Response({"reason": "Tender with the specified ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
+    reader = review_reader.extend(embeds)
+    reviews = reviews_query(tender_id, author_username, reader)
 
-    bids = Bid.objects.filter(
-        tender_id=tender_id,
-        creator_username=author
-    )
+    if cursor is not None:
+        try:
+            page, next_cursor = keyset_page(reviews, cursor, limit)
+        except InvalidCursor:
+            return Response({"reason": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response({"items": reader.read(page), "nextCursor": next_cursor}, status=200)
 
-    responsible = OrganizationResponsible.objects.filter(
-        organization=tender.organization,
-        user=user
-    ).exists()
+    return json_response(reader.read(reviews[offset:offset + limit]), status=200)
 
-    if not responsible:
-        return Response({"reason": "User is not authorized to view reviews for this tender."}, status=status.HTTP_403_FORBIDDEN)
 
-    reviews = Review.objects.filter(bid__in=bids)[offset:offset + limit]
-    serializer = ReviewSerializer(reviews, many=True)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_changes(request):
+    """
+    Лента изменений тендеров и предложений: события с номером больше since по возрастанию.
+    limit - размер страницы. Следующий запрос - с since=nextSince.
+    Long-poll (wait) - только в async-версии (ASYNC_VIEWS): здесь ожидание заняло бы поток
+    воркера, поэтому wait проверяется, но ответ отдается сразу.
+    """
+    params, reason = change_params(request)
+    if reason:
+        return Response({"reason": reason}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    since, limit, _ = params
+    return json_response(changes_data(since, settled_rows(since, list(changes_query(since, limit)))), status=200)
@@ -0,0 +1,105 @@
+"""
+Синхронные и асинхронные читающие view под нагрузкой при фиксированной памяти.
+
+    python -m backend.benchmarks.async_views --dataset seed.json -c 16 64 256 -d 10 --out async.json
+
+Для каждого режима (ASYNC_VIEWS=false/true) поднимается один процесс uvicorn,
+маршруты из ROUTES нагружаются load.py с каждым уровнем параллельности -c.
+Кроме rps и задержек фиксируются пиковая память процесса (VmHWM) и число потоков:
+синхронная view под ASGI занимает поток на все время запроса.
+Данные - из seed.py; DB_POOL_SIZE и остальные настройки берутся из окружения.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from .dataset import Dataset
+from .load import Routes, run_route
+
+
+ROUTES = ('ping', 'tenders-list', 'my-tenders', 'bids-list', 'my-bids', 'get-reviews')
+
+
+def process_status(pid):
+    """
+    Пиковая память (МБ) и число потоков процесса из /proc/<pid>/status.
+    """
+    values = {}
+    with open(f'/proc/{pid}/status') as file:
+        for line in file:
+            key, _, value = line.partition(':')
+            values[key] = value.split()
+    return {'peak_rss_mb': round(int(values['VmHWM'][0]) / 1024, 1), 'threads': int(values['Threads'][0])}
+
+
+def start_server(port, async_views):
+    env = dict(os.environ, ASYNC_VIEWS='true' if async_views else 'false', QUERY_BUDGET_MODE='off')
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', 'backend.tenders_app.asgi:application',
+            '--port', str(port), '--lifespan', 'off', '--no-access-log', '--log-level', 'warning',
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/api/ping').status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise SystemExit('uvicorn did not start')
+
+
+async def run_mode(args, dataset, server):
+    builders = Routes(dataset, args.seed).build()
+    results = {}
+    for concurrency in args.concurrency:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{args.port}', limits=limits, timeout=60) as client:
+            for name in args.routes:
+                result = await run_route(client, builders[name], concurrency, args.duration)
+                result.update(process_status(server.pid))
+                results.setdefault(name, {})[concurrency] = result
+                print(json.dumps({'route': name, 'concurrency': concurrency, **result}), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', required=True, help='dataset description written by seed.py --out')
+    parser.add_argument('-c', '--concurrency', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('-d', '--duration', type=float, default=10, help='seconds per route and concurrency level')
+    parser.add_argument('--routes', nargs='+', default=list(ROUTES), choices=ROUTES)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='write the full report to this file')
+    args = parser.parse_args()
+
+    with open(args.dataset) as file:
+        dataset = Dataset.from_dict(json.load(file)['dataset'])
+
+    report = {'dataset': dataset.as_dict(), 'duration': args.duration, 'modes': {}}
+    for mode in ('sync', 'async'):
+        server = start_server(args.port, mode == 'async')
+        try:
+            report['modes'][mode] = asyncio.run(run_mode(args, dataset, server))
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
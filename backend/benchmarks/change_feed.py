@@ -0,0 +1,97 @@
+"""
+Замер цены ленты изменений для записи: пропускная способность параллельных транзакций
+изменения с записью события (record_changes) и без нее.
+
+    python -m backend.benchmarks.change_feed --threads 1,8,32 --duration 5 --commit-delay 0
+
+Каждый поток в своей транзакции меняет свой тендер (блокировки строк не пересекаются)
+и, в режиме record, записывает событие последним запросом перед COMMIT, как views.
+Общий счетчик, заблокированный от записи события до фиксации, ограничивал бы record
+величиной 1 / (время от record_changes до конца COMMIT) на все потоки; номера из
+sequence (миграция 0011) транзакции не упорядочивают. --commit-delay (мс) добавляет паузу
+между записью события и COMMIT - задержку сети до БД или работу после record_changes.
+Тендеры берутся из базы настроек Django, события фиксируются в ленте - запускать на тестовой базе.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import django
+
+
+def worker(tender_id, record, commit_delay, deadline, counts):
+    from django.db import connection, transaction
+
+    from backend.apps.changes import EDITED, record_changes
+
+    done = 0
+    try:
+        while time.monotonic() < deadline:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'UPDATE tender SET version = version WHERE id = %s RETURNING status, version', [tender_id],
+                    )
+                    tender_status, version = cursor.fetchone()
+                if record:
+                    record_changes([('tender', tender_id, EDITED, tender_status, version)])
+                if commit_delay:
+                    time.sleep(commit_delay / 1000)
+            done += 1
+    finally:
+        connection.close()
+    counts.append(done)
+
+
+def measure(tender_ids, record, commit_delay, duration):
+    counts = []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=worker, args=(tender_id, record, commit_delay, deadline, counts))
+        for tender_id in tender_ids
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return round(sum(counts) / duration, 1)
+
+
+def run(args):
+    from backend.apps.models import Tender
+
+    results = []
+    for threads in args.threads:
+        tender_ids = list(Tender.objects.order_by('id').values_list('id', flat=True)[:threads])
+        if len(tender_ids) < threads:
+            raise SystemExit(f'need {threads} tenders, found {len(tender_ids)}')
+        plain = measure(tender_ids, False, args.commit_delay, args.duration)
+        recorded = measure(tender_ids, True, args.commit_delay, args.duration)
+        results.append({
+            'threads': threads,
+            'commit_delay_ms': args.commit_delay,
+            'tx_per_s_without_feed': plain,
+            'tx_per_s_with_feed': recorded,
+            'ratio': round(recorded / plain, 2) if plain else None,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=lambda value: [int(item) for item in value.split(',')], default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--commit-delay', type=float, default=0, help='pause between record_changes and COMMIT, ms')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    django.setup()
+
+    for result in run(args):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Сравнение двух отчетов load.py по маршрутам.
+
+    python -m backend.benchmarks.compare before.json after.json [--json]
+
+Для каждого маршрута: rps, p95 и SQL-запросов на запрос до и после, изменение
+в процентах. --json печатает то же самое машиночитаемо.
+"""
+import argparse
+import json
+
+
+METRICS = (
+    ('rps', 'rps'),
+    ('p50_ms', 'p50 ms'),
+    ('p95_ms', 'p95 ms'),
+    ('p99_ms', 'p99 ms'),
+    ('queries_per_request', 'queries'),
+    ('errors', 'errors'),
+)
+
+
+def change(before, after):
+    if before is None or after is None:
+        return None
+    if not before:
+        return None if after else 0.0
+    return round((after - before) / before * 100, 1)
+
+
+def compare(before, after):
+    routes = {}
+    for name in list(before['routes']) + [name for name in after['routes'] if name not in before['routes']]:
+        old = before['routes'].get(name, {})
+        new = after['routes'].get(name, {})
+        routes[name] = {
+            key: {'before': old.get(key), 'after': new.get(key), 'change_pct': change(old.get(key), new.get(key))}
+            for key, _ in METRICS
+        }
+    return {'dataset_matches': before.get('dataset') == after.get('dataset'), 'routes': routes}
+
+
+def table(result):
+    def cell(value):
+        return '-' if value is None else f'{value:g}'
+
+    header = ['route'] + [f'{title} before/after (%)' for _, title in METRICS]
+    rows = [header]
+    for name, metrics in result['routes'].items():
+        rows.append([name] + [
+            f"{cell(m['before'])} / {cell(m['after'])} ({cell(m['change_pct'])})"
+            for m in (metrics[key] for key, _ in METRICS)
+        ])
+    widths = [max(len(row[index]) for row in rows) for index in range(len(header))]
+    return '\n'.join('  '.join(value.ljust(width) for value, width in zip(row, widths)) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--json', action='store_true', help='print the comparison as JSON')
+    args = parser.parse_args()
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    result = compare(before, after)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    if not result['dataset_matches']:
+        print('Warning: the runs used different datasets.\n')
+    print(table(result))
+
+
+if __name__ == '__main__':
+    main()
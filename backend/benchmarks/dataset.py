@@ -0,0 +1,69 @@
+"""
+Детерминированный синтетический набор данных для бенчмарков.
+
+Идентификаторы вычисляются из порядковых номеров одинаково в SQL (seed.py)
+и в Python (load.py), поэтому нагрузочному тесту достаточно размеров набора.
+"""
+import hashlib
+import uuid
+
+
+# Ответственных за каждую организацию
+RESPONSIBLE_PER_ORGANIZATION = 3
+
+SERVICE_TYPES = ('Construction', 'Delivery', 'Manufacture')
+
+
+def md5_uuid(value):
+    """
+    То же, что md5(value)::uuid в PostgreSQL.
+    """
+    return str(uuid.UUID(hashlib.md5(value.encode()).hexdigest()))
+
+
+class Dataset:
+    """
+    Размеры набора и правила связей между сущностями (номера с 1).
+
+    Сотрудник i ответственен за организацию (i - 1) % organizations + 1, пока
+    i <= organizations * RESPONSIBLE_PER_ORGANIZATION. Тендер t принадлежит
+    организации (t - 1) % organizations + 1 и создан ее первым ответственным.
+    Предложение b подано на тендер (b - 1) % tenders + 1 от следующей организации.
+    Первые versioned_tenders тендеров и предложений имеют по versions версий в истории.
+    """
+
+    def __init__(self, organizations, employees, tenders, bids, versioned, versions, reviews):
+        self.organizations = organizations
+        self.employees = employees
+        self.tenders = tenders
+        self.bids = bids
+        self.versioned = versioned
+        self.versions = versions
+        self.reviews = reviews
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in (
+            'organizations', 'employees', 'tenders', 'bids', 'versioned', 'versions', 'reviews',
+        )})
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def organization_id(self, organization):
+        return md5_uuid(f'org{organization}')
+
+    def username(self, employee):
+        return f'user{employee}'
+
+    def responsible(self, organization, k=0):
+        return self.username(organization + k * self.organizations)
+
+    def tender_organization(self, tender):
+        return (tender - 1) % self.organizations + 1
+
+    def bid_tender(self, bid):
+        return (bid - 1) % self.tenders + 1
+
+    def bid_organization(self, bid):
+        return self.tender_organization(self.bid_tender(bid)) % self.organizations + 1
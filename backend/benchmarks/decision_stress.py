@@ -0,0 +1,102 @@
+"""
+Стресс-проверка submit_decision: сотни параллельных решений по одному предложению.
+
+    python -m backend.benchmarks.decision_stress --url http://localhost:8080 \\
+        --tender-id 1 --bid-id 1 --usernames user1,user2,user3 --responsibles 3 --repeat 100
+
+Все пользователи должны быть ответственными за организацию тендера, --responsibles -
+сколько всего ответственных у организации (по умолчанию - число пользователей).
+Кворум - min(3, ответственных). Ожидается: не больше одного успешного голоса на
+пользователя; если пользователей не меньше кворума - ровно кворум успешных голосов,
+votes_for равен кворуму, предложение принято, тендер закрыт; иначе - по одному
+голосу от каждого, votes_for равен числу пользователей, тендер не закрыт.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import sys
+
+import httpx
+
+
+# Как services.MAX_QUORUM
+MAX_QUORUM = 3
+
+
+async def decide(client, semaphore, bid_id, username):
+    async with semaphore:
+        response = await client.patch(
+            '/api/bids/submit_decision',
+            params={'bidId': bid_id, 'username': username, 'decision': 'Accept'},
+        )
+        return username, response.status_code
+
+
+async def run(args):
+    usernames = [username for username in args.usernames.split(',') if username]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        results = await asyncio.gather(*(
+            decide(client, semaphore, args.bid_id, username)
+            for _ in range(args.repeat) for username in usernames
+        ))
+
+        bids = (await client.get(
+            f'/api/bids/{args.tender_id}/list', params={'username': usernames[0], 'limit': 1000},
+        )).json()
+        tender_status = (await client.get(
+            f'/api/tenders/{args.tender_id}/status', params={'username': usernames[0]},
+        )).json()['status']
+
+    accepted = collections.Counter(username for username, code in results if code == 200)
+    codes = collections.Counter(code for _, code in results)
+    bid = next(bid for bid in bids if bid['id'] == args.bid_id)
+    votes_for = bid['votes_for']
+
+    required = max(1, min(MAX_QUORUM, args.responsibles or len(usernames)))
+    approved = len(usernames) >= required
+    expected_votes = required if approved else len(usernames)
+
+    failures = []
+    if any(count > 1 for count in accepted.values()):
+        failures.append(f'expected at most one accepted vote per user, got {dict(accepted)}')
+    if sum(accepted.values()) != expected_votes:
+        failures.append(f'{sum(accepted.values())} accepted votes, expected {expected_votes}')
+    if votes_for != expected_votes:
+        failures.append(f'votes_for is {votes_for}, expected {expected_votes}')
+    if approved and (bid['status'] != 'APPROVED' or tender_status != 'CLOSED'):
+        failures.append(f'bid {bid["status"]}, tender {tender_status}, expected APPROVED and CLOSED')
+    if not approved and tender_status == 'CLOSED':
+        failures.append(f'tender closed with {votes_for} of {required} votes')
+
+    return {
+        'requests': len(results),
+        'status_codes': dict(codes),
+        'quorum': required,
+        'votes_for': votes_for,
+        'bid_status': bid['status'],
+        'tender_status': tender_status,
+        'failures': failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--tender-id', type=int, required=True)
+    parser.add_argument('--bid-id', type=int, required=True)
+    parser.add_argument('--usernames', required=True)
+    parser.add_argument('--responsibles', type=int, help='responsibles of the tender organization (default: users)')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('-c', '--concurrency', type=int, default=200)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report))
+    sys.exit(1 if report['failures'] else 0)
+
+
+if __name__ == '__main__':
+    main()
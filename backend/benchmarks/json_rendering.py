@@ -0,0 +1,85 @@
+"""
+Замер CPU на сериализацию ответа и разбор тела запроса: стандартные
+JSONRenderer/JSONParser DRF против ORJSONRenderer/ORJSONParser (и ujson для сравнения).
+
+    python -m backend.benchmarks.json_rendering --iterations 2000
+
+Данные - выход TenderSerializer/BidSerializer для страниц типичного размера,
+поэтому замер включает ReturnList/ReturnDict, строки дат и UUID.
+"""
+import argparse
+import io
+import json
+import os
+import time
+
+import django
+
+
+PAGE_SIZES = (1, 5, 50)
+
+
+def payloads():
+    from backend.apps.models import Bid, Tender
+    from backend.apps.serializers import BidSerializer, TenderSerializer
+    from backend.benchmarks.list_serialization import bid_rows, instances, tender_rows
+
+    tenders = TenderSerializer(instances(Tender, tender_rows(max(PAGE_SIZES))), many=True).data
+    bids = BidSerializer(instances(Bid, bid_rows(max(PAGE_SIZES))), many=True).data
+    result = {}
+    for size in PAGE_SIZES:
+        result[f'tenders[{size}]'] = tenders[0] if size == 1 else tenders[:size]
+        result[f'bids[{size}]'] = bids[0] if size == 1 else bids[:size]
+    result['tenders cursor page'] = {'items': tenders[:5], 'nextCursor': 'WyIyMDI0LTAxLTAxVDAwOjAwOjA0KzAwOjAwIiwiNCJd'}
+    return result
+
+
+def per_call_us(function, iterations):
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return round((time.process_time() - started) / iterations * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    django.setup()
+
+    import ujson
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from backend.apps.renderers import ORJSONParser, ORJSONRenderer
+
+    stock_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+    stock_parser, fast_parser = JSONParser(), ORJSONParser()
+
+    for name, data in payloads().items():
+        body = stock_renderer.render(data)
+        assert fast_renderer.render(data) == body, f'{name}: output differs'
+        assert fast_parser.parse(io.BytesIO(body)) == stock_parser.parse(io.BytesIO(body))
+
+        render_json = per_call_us(lambda: stock_renderer.render(data), args.iterations)
+        render_orjson = per_call_us(lambda: fast_renderer.render(data), args.iterations)
+        parse_json = per_call_us(lambda: stock_parser.parse(io.BytesIO(body)), args.iterations)
+        parse_orjson = per_call_us(lambda: fast_parser.parse(io.BytesIO(body)), args.iterations)
+        print(json.dumps({
+            'payload': name,
+            'bytes': len(body),
+            'render_json_us': render_json,
+            'render_ujson_us': per_call_us(
+                lambda: ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False, default=str).encode(), args.iterations
+            ),
+            'render_orjson_us': render_orjson,
+            'render_saved_us': round(render_json - render_orjson, 2),
+            'parse_json_us': parse_json,
+            'parse_orjson_us': parse_orjson,
+        }, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
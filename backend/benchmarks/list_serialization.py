@@ -0,0 +1,116 @@
+"""
+Микробенчмарк сериализации списков: TenderSerializer/BidSerializer + JSONRenderer
+против RowReader + orjson на одних и тех же строках (без обращения к БД).
+
+    python -m backend.benchmarks.list_serialization --rows 10000 --repeat 5
+
+Проверяет, что оба пути дают одинаковые байты, и печатает строк в секунду.
+"""
+import argparse
+import datetime
+import json
+import os
+import time
+import uuid
+
+import django
+
+
+def tender_rows(count):
+    organization_id = uuid.uuid4()
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            'id': index,
+            'name': f'Tender {index}',
+            'description': 'Поставка строительных материалов, ' * 4,
+            'service_type': 'Construction',
+            'status': 'PUBLISHED',
+            'organization_id': organization_id,
+            'creator_username_id': f'user{index % 50}',
+            'created_at': created_at + datetime.timedelta(seconds=index, microseconds=index),
+            'updated_at': None,
+            'version': 1,
+        }
+        for index in range(count)
+    ]
+
+
+def bid_rows(count):
+    rows = tender_rows(count)
+    for row in rows:
+        del row['service_type']
+        row['tender_id'] = row['id'] // 10
+        row['votes_for'] = 0
+    return rows
+
+
+def instances(model, rows):
+    """
+    Объекты модели с заранее подставленными связанными пользователями,
+    чтобы SlugRelatedField не ходил в БД.
+    """
+    from backend.apps.models import Employee
+
+    employees = {}
+    objects = []
+    for row in rows:
+        obj = model(**row)
+        username = row['creator_username_id']
+        obj.creator_username = employees.setdefault(username, Employee(username=username))
+        objects.append(obj)
+    return objects
+
+
+def measure(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return body, best
+
+
+def compare(name, serializer_class, model, rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    from backend.apps.readers import RowReader
+    from backend.apps.renderers import render_json
+
+    objects = instances(model, rows)
+    reader = RowReader(serializer_class)
+
+    baseline, baseline_seconds = measure(
+        lambda: JSONRenderer().render(serializer_class(objects, many=True).data), repeat
+    )
+    fast, fast_seconds = measure(lambda: render_json(reader.read(rows)), repeat)
+    assert fast == baseline, f'{name}: output differs'
+
+    return {
+        'list': name,
+        'rows': len(rows),
+        'serializer_rows_per_sec': round(len(rows) / baseline_seconds),
+        'reader_rows_per_sec': round(len(rows) / fast_seconds),
+        'speedup': round(baseline_seconds / fast_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    django.setup()
+
+    from backend.apps.models import Bid, Tender
+    from backend.apps.serializers import BidSerializer, TenderSerializer
+
+    print(json.dumps(compare('tenders', TenderSerializer, Tender, tender_rows(args.rows), args.repeat)))
+    print(json.dumps(compare('bids', BidSerializer, Bid, bid_rows(args.rows), args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Нагрузочный прогон всех маршрутов API на данных из seed.py.
+
+    python -m backend.benchmarks.seed --reset --out seed.json
+    python -m backend.benchmarks.load --url http://localhost:8080 --dataset seed.json \\
+        -c 32 -d 10 --out run.json
+    python -m backend.benchmarks.compare before.json run.json
+
+Каждый маршрут нагружается по очереди -d секунд с -c параллельными клиентами.
+Для каждого маршрута: число запросов, rps, p50/p95/p99, коды ответов и SQL-запросы
+на запрос (из заголовка Server-Timing). --routes ограничивает набор маршрутов.
+Изменяющие маршруты меняют данные, перед сравнением прогонов набор пересоздается.
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import random
+import re
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from .dataset import SERVICE_TYPES, Dataset
+
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+class Routes:
+    """
+    Построители запросов по маршрутам: k - номер запроса в прогоне маршрута.
+    """
+
+    def __init__(self, dataset, seed):
+        self.data = dataset
+        self.rng = random.Random(seed)
+
+    def tender(self):
+        # Тендеры без истории: их правки не мешают откатам по истории
+        return self.rng.randint(min(self.data.versioned + 1, self.data.tenders), self.data.tenders)
+
+    def bid(self):
+        return self.rng.randint(min(self.data.versioned + 1, self.data.bids), self.data.bids)
+
+    def organization(self):
+        return self.rng.randint(1, self.data.organizations)
+
+    def tender_owner(self, tender, k=0):
+        return self.data.responsible(self.data.tender_organization(tender), k)
+
+    def bid_author(self, bid):
+        return self.data.responsible(self.data.bid_organization(bid))
+
+    def new_tender(self):
+        organization = self.organization()
+        return {
+            'name': f'Load tender {self.rng.random():.8f}',
+            'description': 'Created by the load test',
+            'serviceType': self.rng.choice(SERVICE_TYPES),
+            'organizationId': self.data.organization_id(organization),
+            'creatorUsername': self.data.responsible(organization),
+            'version': 1,
+        }
+
+    def new_bid(self):
+        tender = self.tender()
+        organization = self.data.tender_organization(tender) % self.data.organizations + 1
+        return {
+            'name': f'Load bid {self.rng.random():.8f}',
+            'description': 'Created by the load test',
+            'tenderId': tender,
+            'organizationId': self.data.organization_id(organization),
+            'creatorUsername': self.data.responsible(organization),
+        }
+
+    def recent(self, seconds=300):
+        return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+    def rollback_target(self, k):
+        # Каждый запрос откатывает свой (объект, версия): версии идут вниз от последней
+        versioned = max(self.data.versioned, 1)
+        return k % versioned + 1, max(self.data.versions - k // versioned, 1)
+
+    def build(self):
+        data = self.data
+        return {
+            'ping': lambda k: ('GET', '/api/ping', None, None),
+            'health': lambda k: ('GET', '/api/health', None, None),
+            'ready': lambda k: ('GET', '/api/ready', None, None),
+            'cache-stats': lambda k: ('GET', '/api/cache/stats', None, None),
+            'db-pool-stats': lambda k: ('GET', '/api/db/pool', None, None),
+            'metrics': lambda k: ('GET', '/metrics', None, None),
+            'tenders-list': lambda k: ('GET', '/api/tenders', {
+                'limit': 5, 'offset': self.rng.randint(0, 1000), 'service_type': self.rng.choice(SERVICE_TYPES),
+            }, None),
+            'tenders-list[cursor]': lambda k: ('GET', '/api/tenders', {'limit': 50, 'cursor': ''}, None),
+            'my-tenders': lambda k: ('GET', '/api/tenders/my', {
+                'username': data.responsible(self.organization()), 'limit': 5,
+            }, None),
+            'create-tender': lambda k: ('POST', '/api/tenders/new', None, self.new_tender()),
+            'create-tenders-bulk': lambda k: ('POST', '/api/tenders/bulk', None, [self.new_tender() for _ in range(100)]),
+            'upd-tender-status[GET]': lambda k: (lambda t: ('GET', f'/api/tenders/{t}/status', {
+                'username': self.tender_owner(t),
+            }, None))(self.tender()),
+            'upd-tender-status[PUT]': lambda k: (lambda t: ('PUT', f'/api/tenders/{t}/status', {
+                'username': self.tender_owner(t), 'status': 'PUBLISHED',
+            }, None))(self.tender()),
+            'edit-tender': lambda k: (lambda t: ('PATCH', f'/api/tenders/{t}/edit', {
+                'username': self.tender_owner(t),
+            }, {'description': f'Edited {k}'}))(self.tender()),
+            'rollback-tender': lambda k: (lambda t, v: ('PUT', f'/api/tenders/{t}/rollback/{v}/', {
+                'username': self.tender_owner(t),
+            }, None))(*self.rollback_target(k)),
+            'bids-list': lambda k: (lambda t: ('GET', f'/api/bids/{t}/list', {
+                'username': self.tender_owner(t), 'limit': 5,
+            }, None))(self.tender()),
+            'bids-stats': lambda k: (lambda t: ('GET', f'/api/bids/{t}/stats', {
+                'username': self.tender_owner(t),
+            }, None))(self.tender()),
+            'my-bids': lambda k: ('GET', '/api/bids/my', {'username': data.responsible(self.organization())}, None),
+            'create-bid': lambda k: ('POST', '/api/bids/new', None, self.new_bid()),
+            'create-bids-bulk': lambda k: ('POST', '/api/bids/bulk', None, [self.new_bid() for _ in range(100)]),
+            'upd-bid-status[GET]': lambda k: (lambda b: ('GET', f'/api/bids/{b}/status', {
+                'username': self.bid_author(b),
+            }, None))(self.bid()),
+            'upd-bid-status[PUT]': lambda k: (lambda b: ('PUT', f'/api/bids/{b}/status', None, {
+                'username': self.bid_author(b), 'status': 'PUBLISHED',
+            }))(self.bid()),
+            'edit-bid': lambda k: (lambda b: ('PATCH', f'/api/bids/{b}/edit', {
+                'username': self.bid_author(b),
+            }, {'description': f'Edited {k}'}))(self.bid()),
+            'rollback-bid': lambda k: (lambda b, v: ('PUT', f'/api/bids/{b}/rollback/{v}/', {
+                'username': self.bid_author(b),
+            }, None))(*self.rollback_target(k)),
+            'submit-decision': lambda k: (lambda b: ('PATCH', '/api/bids/submit_decision', {
+                'bidId': b, 'username': self.tender_owner(data.bid_tender(b), k % 3), 'decision': 'Accept',
+            }, None))(self.bid()),
+            'get-reviews': lambda k: (lambda b: ('GET', f'/api/bids/{data.bid_tender(b)}/reviews', {
+                'authorUsername': self.bid_author(b),
+                'requestUsername': self.tender_owner(data.bid_tender(b)),
+                'limit': 5,
+            }, None))(self.rng.randint(1, max(min(data.reviews, data.bids), 1))),
+            'changes': lambda k: ('GET', '/api/changes', {'since': self.rng.randint(0, 1000), 'limit': 100}, None),
+            # Инкрементальная выгрузка: изменения за последние 5 минут
+            'export-tenders': lambda k: ('GET', '/api/tenders/export', {'updatedSince': self.recent()}, None),
+            'export-tenders[csv]': lambda k: ('GET', '/api/tenders/export', {
+                'username': data.responsible(self.organization()), 'exportFormat': 'csv', 'updatedSince': self.recent(),
+            }, None),
+            'export-bids': lambda k: ('GET', '/api/bids/export', {
+                'username': data.responsible(self.organization()), 'updatedSince': self.recent(),
+            }, None),
+            'leave-feedback': lambda k: (lambda b: ('PUT', f'/api/bids/{b}/feedback', {
+                'username': self.bid_author(b), 'bidFeedback': f'Feedback {k}',
+            }, None))(self.bid()),
+        }
+
+
+async def worker(client, build, counter, deadline, samples):
+    while time.perf_counter() < deadline:
+        method, path, params, body = build(next(counter))
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, json=body)
+            code = response.status_code
+            timing = SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing', ''))
+        except httpx.HTTPError as exc:
+            code, timing = type(exc).__name__, None
+        samples.append((
+            time.perf_counter() - started,
+            code,
+            int(timing.group(2)) if timing else None,
+            float(timing.group(1)) if timing else None,
+        ))
+
+
+async def run_route(client, build, concurrency, duration):
+    counter = itertools.count()
+    samples = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(client, build, counter, deadline, samples) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [sample[0] for sample in samples]
+    queries = [sample[2] for sample in samples if sample[2] is not None]
+    db_ms = [sample[3] for sample in samples if sample[3] is not None]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0] if latencies else 0] * 99
+    statuses = collections.Counter(str(sample[1]) for sample in samples)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'p99_ms': round(quantiles[98] * 1000, 2),
+        'errors': sum(count for code, count in statuses.items() if not code.isdigit() or code >= '500'),
+        'statuses': dict(sorted(statuses.items())),
+        'queries_per_request': round(statistics.mean(queries), 2) if queries else None,
+        'db_ms_per_request': round(statistics.mean(db_ms), 2) if db_ms else None,
+    }
+
+
+async def run(args, dataset):
+    routes = Routes(dataset, args.seed).build()
+    selected = [name for name in routes if not args.routes or name in args.routes]
+    unknown = set(args.routes or ()) - set(routes)
+    if unknown:
+        raise SystemExit(f'Unknown routes: {", ".join(sorted(unknown))}')
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        for name in selected:
+            results[name] = await run_route(client, routes[name], args.concurrency, args.duration)
+            print(json.dumps({'route': name, **results[name]}), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--dataset', required=True, help='dataset description written by seed.py --out')
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-d', '--duration', type=float, default=10, help='seconds per route')
+    parser.add_argument('--routes', nargs='*', help='route names to run (default: all)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='write the full report to this file')
+    args = parser.parse_args()
+
+    with open(args.dataset) as file:
+        dataset = Dataset.from_dict(json.load(file)['dataset'])
+
+    report = {
+        'url': args.url,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'dataset': dataset.as_dict(),
+        'routes': asyncio.run(run(args, dataset)),
+    }
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""
+Заполнение локальной PostgreSQL синтетическими данными для бенчмарков.
+
+    python -m backend.benchmarks.seed --reset --out seed.json
+
+По умолчанию: 10k организаций, 100k сотрудников, 1M тендеров, 1M предложений,
+1000 тендеров и 1000 предложений с историей по 50 версий, 100k отзывов.
+Данные генерируются на стороне сервера (INSERT ... SELECT generate_series).
+Номера тендеров и предложений - 1..N, поэтому таблицы должны быть пустыми,
+--reset очищает их (TRUNCATE) вместе с лентой изменений.
+Описание набора (dataset.Dataset) печатается и пишется в --out для load.py.
+"""
+import argparse
+import json
+import os
+import time
+
+import django
+
+from .dataset import RESPONSIBLE_PER_ORGANIZATION, Dataset
+
+
+TABLES = (
+    'review', 'bid_voters', 'bid_version', 'tender_version', 'tender_bid_stats', 'bid', 'tender',
+    'organization_responsible', 'employee', 'organization', 'change_event',
+)
+
+
+def column_type(cursor, table, column):
+    """
+    Тип столбца как в DDL: статусы и виды услуг могут быть enum, а не текстом.
+    """
+    cursor.execute(
+        'SELECT format_type(atttypid, atttypmod) FROM pg_attribute WHERE attrelid = %s::regclass AND attname = %s',
+        [table, column],
+    )
+    return cursor.fetchone()[0]
+
+
+def statements(cursor, dataset, snapshot_interval):
+    types = {
+        (table, column): column_type(cursor, table, column)
+        for table, column in (
+            ('organization', 'type'),
+            ('tender', 'status'), ('tender', 'service_type'),
+            ('bid', 'status'),
+            ('tender_version', 'status'), ('tender_version', 'service_type'),
+            ('bid_version', 'status'),
+        )
+    }
+    params = {
+        'organizations': dataset.organizations,
+        'employees': dataset.employees,
+        'tenders': dataset.tenders,
+        'bids': dataset.bids,
+        'versioned': dataset.versioned,
+        'versions': dataset.versions,
+        'reviews': dataset.reviews,
+        'responsible': min(dataset.employees, dataset.organizations * RESPONSIBLE_PER_ORGANIZATION),
+        'interval': snapshot_interval,
+    }
+    # Организация тендера t и предложения b (см. Dataset)
+    tender_org = 'mod(t - 1, %(organizations)s) + 1'
+    bid_tender = 'mod(b - 1, %(tenders)s) + 1'
+    bid_org = f'mod(mod({bid_tender} - 1, %(organizations)s) + 1, %(organizations)s) + 1'
+    tender_status = "CASE WHEN mod(t, 10) < 8 THEN 'PUBLISHED' WHEN mod(t, 10) = 8 THEN 'CREATED' ELSE 'CLOSED' END"
+    service_type = "(ARRAY['Construction', 'Delivery', 'Manufacture'])[1 + mod(t, 3)]"
+    bid_status = "CASE WHEN mod(b, 10) < 7 THEN 'PUBLISHED' ELSE 'CREATED' END"
+
+    return params, [
+        ('organizations', f'''
+            INSERT INTO organization (id, name, description, type, created_at, updated_at)
+            SELECT md5('org' || o)::uuid, 'Organization ' || o, 'Seeded organization ' || o,
+                   'LLC'::{types['organization', 'type']}, now(), now()
+            FROM generate_series(1, %(organizations)s) o
+        '''),
+        ('employees', '''
+            INSERT INTO employee (id, username, first_name, last_name, created_at, updated_at)
+            SELECT md5('employee' || e)::uuid, 'user' || e, 'First' || e, 'Last' || e, now(), now()
+            FROM generate_series(1, %(employees)s) e
+        '''),
+        ('responsibles', '''
+            INSERT INTO organization_responsible (id, organization_id, user_id)
+            SELECT md5('responsible' || e)::uuid, md5('org' || (mod(e - 1, %(organizations)s) + 1))::uuid,
+                   md5('employee' || e)::uuid
+            FROM generate_series(1, %(responsible)s) e
+        '''),
+        ('tenders', f'''
+            INSERT INTO tender (id, name, description, service_type, status, organization_id, creator_username,
+                                created_at, updated_at, version)
+            SELECT t, 'Tender ' || t, repeat('Seeded tender description. ', 1 + mod(t, 20)),
+                   ({service_type})::{types['tender', 'service_type']},
+                   ({tender_status})::{types['tender', 'status']},
+                   md5('org' || ({tender_org}))::uuid, 'user' || ({tender_org}),
+                   now() - (%(tenders)s - t) * interval '1 second', NULL,
+                   CASE WHEN t <= %(versioned)s THEN %(versions)s + 1 ELSE 1 END
+            FROM generate_series(1, %(tenders)s) t
+            ORDER BY t
+        '''),
+        ('bids', f'''
+            INSERT INTO bid (id, name, description, status, tender_id, organization_id, creator_username,
+                             created_at, updated_at, version, votes_for)
+            SELECT b, 'Bid ' || b, 'Seeded bid ' || b, ({bid_status})::{types['bid', 'status']}, {bid_tender},
+                   md5('org' || ({bid_org}))::uuid, 'user' || ({bid_org}),
+                   now() - (%(bids)s - b) * interval '1 second', NULL,
+                   CASE WHEN b <= %(versioned)s THEN %(versions)s + 1 ELSE 1 END, 0
+            FROM generate_series(1, %(bids)s) b
+            ORDER BY b
+        '''),
+        # Номера тендеров и предложений заданы явно - сдвигаем последовательности
+        ('sequences', '''
+            SELECT setval(pg_get_serial_sequence('tender', 'id'), %(tenders)s),
+                   setval(pg_get_serial_sequence('bid', 'id'), %(bids)s)
+        '''),
+        # История: полный снимок каждые VERSION_SNAPSHOT_INTERVAL версий, между ними - смена имени
+        ('tender versions', f'''
+            INSERT INTO tender_version (tender_id, version, name, description, service_type, status,
+                                        organization_id, creator_username, created_at, updated_at,
+                                        changed_fields)
+            SELECT t, v, 'Tender ' || t || ' v' || v,
+                   CASE WHEN snapshot THEN repeat('Seeded tender description. ', 1 + mod(t, 20)) END,
+                   CASE WHEN snapshot THEN ({service_type})::{types['tender_version', 'service_type']} END,
+                   CASE WHEN snapshot THEN ({tender_status})::{types['tender_version', 'status']} END,
+                   CASE WHEN snapshot THEN md5('org' || ({tender_org}))::uuid END,
+                   CASE WHEN snapshot THEN 'user' || ({tender_org}) END,
+                   CASE WHEN snapshot THEN now() - (%(tenders)s - t) * interval '1 second' END,
+                   NULL,
+                   CASE WHEN snapshot THEN NULL ELSE '["name", "version"]'::jsonb END
+            FROM generate_series(1, least(%(versioned)s, %(tenders)s)) t,
+                 generate_series(1, %(versions)s) v,
+                 LATERAL (SELECT mod(v - 1, %(interval)s) = 0 AS snapshot) s
+        '''),
+        ('bid versions', f'''
+            INSERT INTO bid_version (bid_id, version, name, description, status, tender_id,
+                                     organization_id, creator_username, created_at, updated_at,
+                                     votes_for, changed_fields)
+            SELECT b, v, 'Bid ' || b || ' v' || v,
+                   CASE WHEN snapshot THEN 'Seeded bid ' || b END,
+                   CASE WHEN snapshot THEN ({bid_status})::{types['bid_version', 'status']} END,
+                   CASE WHEN snapshot THEN {bid_tender} END,
+                   CASE WHEN snapshot THEN md5('org' || ({bid_org}))::uuid END,
+                   CASE WHEN snapshot THEN 'user' || ({bid_org}) END,
+                   CASE WHEN snapshot THEN now() - (%(bids)s - b) * interval '1 second' END,
+                   NULL,
+                   CASE WHEN snapshot THEN 0 END,
+                   CASE WHEN snapshot THEN NULL ELSE '["name", "version"]'::jsonb END
+            FROM generate_series(1, least(%(versioned)s, %(bids)s)) b,
+                 generate_series(1, %(versions)s) v,
+                 LATERAL (SELECT mod(v - 1, %(interval)s) = 0 AS snapshot) s
+        '''),
+        # Отзыв на предложение оставляет ответственный за организацию предложения
+        ('reviews', f'''
+            INSERT INTO review (id, bid_id, user_id, content, created_at, updated_at)
+            SELECT md5('review' || r)::uuid, b, md5('employee' || ({bid_org}))::uuid, 'Review ' || r,
+                   now() - (%(reviews)s - r) * interval '1 second', now()
+            FROM generate_series(1, %(reviews)s) r,
+                 LATERAL (SELECT mod(r - 1, %(bids)s) + 1 AS b) x
+        '''),
+    ]
+
+
+def seed(dataset, reset):
+    from django.conf import settings
+    from django.db import connection
+
+    timings = {}
+    with connection.cursor() as cursor:
+        # Заполнение идет дольше DB_STATEMENT_TIMEOUT
+        cursor.execute('SET statement_timeout = 0')
+        if reset:
+            # RESTART IDENTITY сбрасывает и change_event_seq: номера событий - снова с 1
+            cursor.execute(f'TRUNCATE {", ".join(TABLES)} RESTART IDENTITY CASCADE')
+        else:
+            cursor.execute('SELECT EXISTS (SELECT 1 FROM tender) OR EXISTS (SELECT 1 FROM employee)')
+            if cursor.fetchone()[0]:
+                raise SystemExit('Tables are not empty, use --reset to truncate them.')
+
+        params, steps = statements(cursor, dataset, settings.VERSION_SNAPSHOT_INTERVAL)
+        for name, sql in steps:
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            timings[name] = round(time.perf_counter() - started, 2)
+
+        started = time.perf_counter()
+        cursor.execute(f'ANALYZE {", ".join(TABLES)}')
+        timings['analyze'] = round(time.perf_counter() - started, 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--organizations', type=int, default=10000)
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--tenders', type=int, default=1000000)
+    parser.add_argument('--bids', type=int, default=1000000)
+    parser.add_argument('--versioned', type=int, default=1000, help='tenders and bids with version history')
+    parser.add_argument('--versions', type=int, default=50, help='history depth of each versioned object')
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--reset', action='store_true', help='truncate the tables first')
+    parser.add_argument('--out', help='write the dataset description to this file')
+    args = parser.parse_args()
+
+    if args.employees < args.organizations * RESPONSIBLE_PER_ORGANIZATION:
+        parser.error(f'--employees must be at least {RESPONSIBLE_PER_ORGANIZATION} x --organizations')
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    django.setup()
+
+    dataset = Dataset(
+        args.organizations, args.employees, args.tenders, args.bids,
+        args.versioned, args.versions, args.reviews,
+    )
+    report = {'dataset': dataset.as_dict(), 'seconds': seed(dataset, args.reset)}
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Нагрузочный замер пропускной способности HTTP-сервера.
+
+    python -m backend.benchmarks.serving --url http://localhost:8080/api/ping -c 64 -d 10
+
+Сравнение режимов запуска:
+    python manage.py runserver 0.0.0.0:8080        # dev-сервер Django
+    python -m backend.tenders_app.serve            # uvicorn, WEB_CONCURRENCY воркеров
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client, url, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url, concurrency, duration):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        # Прогрев соединений
+        await asyncio.gather(*(client.get(url) for _ in range(concurrency)))
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, url, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'duration': round(elapsed, 3),
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'p99_ms': round(quantiles[98] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8080/api/ping')
+    parser.add_argument('-c', '--concurrency', type=int, default=64)
+    parser.add_argument('-d', '--duration', type=float, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.url, args.concurrency, args.duration))))
+
+
+if __name__ == '__main__':
+    main()
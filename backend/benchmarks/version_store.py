@@ -0,0 +1,154 @@
+"""
+Замер хранилища версий: объем истории (полные копии против снимков с дельтами)
+и время восстановления версии.
+
+    python -m backend.benchmarks.version_store --edits 200 --description-size 4000
+
+Синтетическая история тендера: каждая правка меняет одно поле, описание - с
+вероятностью --description-share. Объем считается по непустым столбцам строки.
+С --tender-id дополнительно замеряется tender_versions.restore по всем версиям
+тендера в базе из настроек Django.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+
+import django
+
+
+def value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (list, dict)):
+        return len(json.dumps(value))
+    if isinstance(value, (datetime.datetime, int)):
+        return 8
+    return len(str(value))
+
+
+def row_size(row):
+    return sum(value_size(value) for value in row.values())
+
+
+def synthetic_history(edits, description_size, description_share, seed):
+    rng = random.Random(seed)
+    words = ['construction', 'delivery', 'tender', 'materials', 'deadline', 'budget', 'contract', 'quality']
+    description = ' '.join(rng.choice(words) for _ in range(description_size // 8))[:description_size]
+    state = {
+        'name': 'Tender',
+        'description': description,
+        'service_type': 'Construction',
+        'status': 'CREATED',
+        'organization_id': uuid.uuid4(),
+        'creator_username_id': 'user1',
+        'created_at': datetime.datetime(2024, 1, 1),
+        'updated_at': datetime.datetime(2024, 1, 1),
+        'version': 1,
+    }
+    history = [dict(state)]
+    for _ in range(edits):
+        state = dict(state, version=state['version'] + 1)
+        if rng.random() < description_share:
+            position = rng.randrange(len(state['description']))
+            state['description'] = state['description'][:position] + rng.choice(words) + state['description'][position:]
+        else:
+            state[rng.choice(['name', 'status', 'service_type'])] = rng.choice(words)
+        history.append(state)
+    return history
+
+
+def run_synthetic(args):
+    from django.conf import settings
+    from backend.apps.versions import TENDER_FIELDS, decode_rows, encode_version
+
+    history = synthetic_history(args.edits, args.description_size, args.description_share, args.seed)
+
+    rows = []
+    previous = None
+    snapshot_version = None
+    for state in history:
+        snapshot = previous is None or state['version'] - snapshot_version >= settings.VERSION_SNAPSHOT_INTERVAL
+        if snapshot:
+            snapshot_version = state['version']
+        row = encode_version(TENDER_FIELDS, state, previous, snapshot)
+        rows.append(row)
+        previous = state
+
+    full_bytes = sum(row_size(state) for state in history)
+    delta_bytes = sum(row_size(row) for row in rows)
+
+    # Восстановление каждой версии из строк от ее снимка, как это делает VersionStore.restore
+    empty = dict.fromkeys(TENDER_FIELDS + ('description_compressed',))
+    padded = [dict(empty, **row) for row in rows]
+    latencies = []
+    for index, state in enumerate(history):
+        start = index
+        while padded[start]['changed_fields'] is not None:
+            start -= 1
+        started = time.perf_counter()
+        restored = decode_rows(TENDER_FIELDS, padded[start:index + 1])
+        latencies.append(time.perf_counter() - started)
+        assert restored == state, state['version']
+
+    return {
+        'versions': len(history),
+        'snapshot_interval': settings.VERSION_SNAPSHOT_INTERVAL,
+        'compress_min_length': settings.VERSION_COMPRESS_MIN_LENGTH,
+        'full_copy_bytes': full_bytes,
+        'delta_store_bytes': delta_bytes,
+        'saved_percent': round(100 * (1 - delta_bytes / full_bytes), 1),
+        'decode_p50_us': round(statistics.median(latencies) * 1e6, 1),
+        'decode_max_us': round(max(latencies) * 1e6, 1),
+    }
+
+
+def run_database(tender_id):
+    from backend.apps.models import TenderVersion
+    from backend.apps.versions import tender_versions
+
+    versions = list(
+        TenderVersion.objects.filter(tender_id=tender_id).order_by('version').values_list('version', flat=True)
+    )
+    latencies = []
+    for version in versions:
+        started = time.perf_counter()
+        tender_versions.restore(tender_id, version)
+        latencies.append(time.perf_counter() - started)
+    if not latencies:
+        return {'tender_id': tender_id, 'versions': 0}
+    return {
+        'tender_id': tender_id,
+        'versions': len(versions),
+        'restore_p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'restore_max_ms': round(max(latencies) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--edits', type=int, default=200)
+    parser.add_argument('--description-size', type=int, default=4000)
+    parser.add_argument('--description-share', type=float, default=0.3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tender-id', type=int)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+    django.setup()
+
+    print(json.dumps(run_synthetic(args)))
+    if args.tender_id is not None:
+        print(json.dumps(run_database(args.tender_id)))
+
+
+if __name__ == '__main__':
+    main()
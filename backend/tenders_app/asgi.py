@@ -3,5 +3,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+# Под ASGI соединения на поток не переиспользуются - пул процесса (см. settings.py)
+os.environ.setdefault('DB_POOL_SIZE', '10')
 
 application = get_asgi_application()
\ No newline at end of file
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from django.db import OperationalError
+from django.db.backends.postgresql import base
+
+
+# Пулы соединений процесса по alias БД (у каждого воркера свой пул)
+POOLS = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Пул соединений psycopg2 на процесс: не более size открытых соединений,
+    ожидание свободного не дольше timeout секунд.
+    """
+
+    def __init__(self, size, timeout, health_checks):
+        self.size = size
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self.in_use = 0
+        self.created = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def acquire(self, connect):
+        if not self._slots.acquire(blocking=False):
+            started = time.monotonic()
+            self.waits += 1
+            acquired = self._slots.acquire(timeout=self.timeout)
+            self.wait_time += time.monotonic() - started
+            if not acquired:
+                self.timeouts += 1
+                raise OperationalError(f'Connection pool exhausted ({self.size} connections in use).')
+
+        with self._lock:
+            self.in_use += 1
+            connection = self._idle.pop() if self._idle else None
+
+        try:
+            if connection is not None and not self._is_usable(connection):
+                connection.close()
+                connection = None
+            if connection is None:
+                connection = connect()
+                self.created += 1
+        except Exception:
+            self._free_slot()
+            raise
+        return connection
+
+    def release(self, connection):
+        try:
+            # Соединение возвращается в пул без открытой транзакции
+            connection.rollback()
+            reusable = not connection.closed
+        except Exception:
+            reusable = False
+
+        if reusable:
+            with self._lock:
+                self._idle.append(connection)
+        else:
+            connection.close()
+        self._free_slot()
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            in_use = self.in_use
+        return {
+            'size': self.size,
+            'in_use': in_use,
+            'idle': idle,
+            'saturation': round(in_use / self.size, 3),
+            'created': self.created,
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_time, 3),
+            'timeouts': self.timeouts,
+        }
+
+    def _free_slot(self):
+        with self._lock:
+            self.in_use -= 1
+        self._slots.release()
+
+    def _is_usable(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+
+def get_pool(alias, settings_dict):
+    with _pools_lock:
+        if alias not in POOLS:
+            POOLS[alias] = ConnectionPool(
+                size=settings_dict['POOL_SIZE'],
+                timeout=settings_dict.get('POOL_TIMEOUT', 10),
+                health_checks=settings_dict.get('CONN_HEALTH_CHECKS', False),
+            )
+        return POOLS[alias]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL, берущий соединения из пула процесса вместо открытия новых.
+    close() возвращает соединение в пул, поэтому CONN_MAX_AGE должен быть 0.
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        return pool.acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            get_pool(self.alias, self.settings_dict).release(self.connection)
@@ -0,0 +1,40 @@
+import os
+
+import django
+import uvicorn
+from django.conf import settings
+from django.core.management import call_command
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.tenders_app.settings')
+# До загрузки настроек: при workers=1 приложение работает в этом же процессе (см. asgi.py)
+os.environ.setdefault('DB_POOL_SIZE', '10')
+
+
+def main():
+    """
+    Запуск ASGI-приложения под uvicorn с несколькими процессами-воркерами.
+    SIGHUP - плавный перезапуск воркеров, SIGTERM/SIGINT - остановка.
+    Перед запуском - проверки кэшей (apps.E001): ошибка конфигурации останавливает запуск.
+    """
+    django.setup()
+    call_command('check', tags=['caches'], deploy=True)
+    host, _, port = settings.SERVER_ADDRESS.rpartition(':')
+    uvicorn.run(
+        'backend.tenders_app.asgi:application',
+        host=host or '0.0.0.0',
+        port=int(port),
+        workers=settings.WEB_CONCURRENCY,
+        loop='uvloop',
+        http='httptools',
+        lifespan='off',
+        timeout_keep_alive=settings.KEEP_ALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.WEB_MAX_REQUESTS,
+        backlog=settings.WEB_BACKLOG,
+        access_log=settings.WEB_ACCESS_LOG,
+        proxy_headers=True,
+    )
+
+
+if __name__ == '__main__':
+    main()
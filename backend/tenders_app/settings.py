@@ -40,16 +40,25 @@ INSTALLED_APPS = [
     'corsheaders',
 ]
 
+# Реализация JSON для API: orjson или json (стандартные JSONRenderer/JSONParser DRF)
+JSON_BACKEND = os.getenv("JSON_BACKEND", 'orjson')
+JSON_BACKENDS = {
+    'orjson': ('backend.apps.renderers.ORJSONRenderer', 'backend.apps.renderers.ORJSONParser'),
+    'json': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
+}
+JSON_RENDERER, JSON_PARSER = JSON_BACKENDS[JSON_BACKEND]
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'backend.apps.permissions.CallerAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        JSON_RENDERER,
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        JSON_PARSER,
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -57,6 +66,7 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    'backend.apps.metrics.QueryMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -99,24 +109,128 @@ WSGI_APPLICATION = 'backend.tenders_app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_POOL_SIZE > 0 включает пул соединений процесса (backend.tenders_app.db),
+# иначе используются постоянные соединения на поток (DB_CONN_MAX_AGE секунд).
+# Соединения Django привязаны к потоку, а под ASGI синхронный код каждого запроса
+# выполняется в новом потоке: постоянное соединение не переиспользуется и висит до
+# сборки мусора. Поэтому asgi.py и serve.py по умолчанию включают пул (DB_POOL_SIZE=10);
+# DB_CONN_MAX_AGE имеет смысл только для WSGI с постоянными потоками (runserver, gunicorn).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'backend.tenders_app.db' if DB_POOL_SIZE else 'django.db.backends.postgresql',
         'NAME': os.getenv("DB_NAME"),
         'USER': os.getenv("DB_USER"),
         'PASSWORD': os.getenv("DB_PASSWORD"),
         'HOST': os.getenv("DB_HOST"),
         'PORT': os.getenv("DB_PORT"),
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': os.getenv("DB_CONN_HEALTH_CHECKS", 'true').lower() == 'true',
+        'POOL_SIZE': DB_POOL_SIZE,
+        'POOL_TIMEOUT': float(os.getenv("DB_POOL_TIMEOUT", 10)),
         'OPTIONS': {
             'client_encoding': 'utf8',
+            'connect_timeout': int(os.getenv("DB_CONNECT_TIMEOUT", 5)),
+            # Серверный лимит времени выполнения запроса, мс (0 - без ограничения)
+            'options': '-c statement_timeout={}'.format(int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))),
         },
         'TEST': {
             'CHARSET': 'utf8',
+            # Таблицы приложения неуправляемые, а миграции apps дополняют существующую схему:
+            # тестовая БД создается по моделям, таблицы apps - в backend/apps/tests.py
+            'MIGRATE': False,
         },
     }
 }
 
-KEEP_ALIVE_TIMEOUT = 60
+# HTTP-сервер: python -m backend.tenders_app.serve
+SERVER_ADDRESS = os.getenv("SERVER_ADDRESS", '0.0.0.0:8080')
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", 60))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+# Перезапуск воркера после указанного числа запросов (0 - без ограничения)
+WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", 0)) or None
+WEB_BACKLOG = int(os.getenv("WEB_BACKLOG", 2048))
+WEB_ACCESS_LOG = os.getenv("WEB_ACCESS_LOG", 'false').lower() == 'true'
+# Читающие endpoints (ping, списки тендеров, предложений и отзывов) - async-версии из apps/async_views.py
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", 'true').lower() == 'true'
+
+# Общий кэш (LocMem по умолчанию; для нескольких процессов - Redis/Memcached через CACHE_BACKEND)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv("CACHE_BACKEND", 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv("CACHE_LOCATION", ''),
+    }
+}
+
+# Кэш пользователь -> организации, за которые он ответственен. Изменения через ORM
+# сбрасывают его сразу (signals.py), изменения в обход ORM (SQL, другие сервисы) видны
+# не позже чем через CALLER_CACHE_TTL + CALLER_CACHE_LOCAL_TTL секунд
+CALLER_CACHE_ALIAS = os.getenv("CALLER_CACHE_ALIAS", 'default')
+CALLER_CACHE_TTL = int(os.getenv("CALLER_CACHE_TTL", 5))
+CALLER_CACHE_LOCAL_TTL = int(os.getenv("CALLER_CACHE_LOCAL_TTL", 1))
+CALLER_CACHE_MAXSIZE = int(os.getenv("CALLER_CACHE_MAXSIZE", 10000))
+
+# Кэш публичной ленты GET /api/tenders (и ETag/304 по поколению тендеров).
+# Поколение хранится в общем кэше: с кэшем внутри процесса (LocMem, Dummy) сброс после
+# записи в одном воркере не виден остальным, и они отдавали бы устаревшую ленту и 304.
+# Поэтому при WEB_CONCURRENCY > 1 нужен общий бэкенд (docker-compose - Redis): иначе
+# проверка apps.E001 (check --deploy) не дает запустить serve.py; TENDER_FEED_CACHE=false отключает кэш.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+TENDER_FEED_CACHE_ALIAS = os.getenv("TENDER_FEED_CACHE_ALIAS", 'default')
+TENDER_FEED_CACHE = os.getenv("TENDER_FEED_CACHE", 'true').lower() == 'true'
+TENDER_FEED_CACHE_TTL = int(os.getenv("TENDER_FEED_CACHE_TTL", 60))
+TENDER_FEED_CACHE_LOCAL_TTL = int(os.getenv("TENDER_FEED_CACHE_LOCAL_TTL", 2))
+TENDER_FEED_CACHE_MAXSIZE = int(os.getenv("TENDER_FEED_CACHE_MAXSIZE", 1000))
+
+# Бюджеты SQL-запросов по имени URL: превышение пишется в лог ('log'),
+# бросает QueryBudgetExceeded ('raise', для тестов) или не проверяется ('off')
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", 'log')
+# Бюджет - наихудший случай: пользователь не в кэше, страница по курсору доходит до записей
+# без created_at (второй запрос keyset_page), пустая страница предложений проверяет тендер
+QUERY_BUDGETS = {
+    'tenders-list': 2,
+    'my-tenders': 3,
+    'create-tender': 5,
+    'edit-tender': 7,
+    'rollback-tender': 5,
+    'bids-list': 4,
+    'bids-stats': 2,
+    'my-bids': 2,
+    'create-bid': 4,
+    'edit-bid': 7,
+    'rollback-bid': 5,
+    'submit-decision': 11,
+    'get-reviews': 4,
+    'changes': 1,
+}
+
+# Массовое создание: максимум объектов в запросе и размер пачки INSERT
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 5000))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 500))
+
+# Потоковая выгрузка: строк в пачке серверного курсора
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Лента изменений /api/changes: максимум событий в ответе, максимальное ожидание long-poll (с,
+# только async-версия при ASYNC_VIEWS - синхронная отвечает сразу), интервал опроса БД
+# при ожидании (с); CHANGES_LISTEN - будить ожидающих по LISTEN/NOTIFY; CHANGES_GAP_TIMEOUT (с) -
+# через сколько пропуск номера события (откаченная транзакция) перестает задерживать следующие
+CHANGES_MAX_LIMIT = int(os.getenv("CHANGES_MAX_LIMIT", 1000))
+CHANGES_MAX_WAIT = float(os.getenv("CHANGES_MAX_WAIT", 30))
+CHANGES_POLL_INTERVAL = float(os.getenv("CHANGES_POLL_INTERVAL", 1))
+CHANGES_LISTEN = os.getenv("CHANGES_LISTEN", 'true').lower() == 'true'
+CHANGES_GAP_TIMEOUT = float(os.getenv("CHANGES_GAP_TIMEOUT", 10))
+
+# История версий: полный снимок каждые N версий, между ними дельты по полям
+VERSION_SNAPSHOT_INTERVAL = int(os.getenv("VERSION_SNAPSHOT_INTERVAL", 10))
+# Описания не короче этого числа символов хранятся в истории сжатыми
+VERSION_COMPRESS_MIN_LENGTH = int(os.getenv("VERSION_COMPRESS_MIN_LENGTH", 1024))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,11 +1,51 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from backend.apps import views
+from backend.apps import async_views, views
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
 
 
+def api_urlpatterns(read_views):
+    """
+    URL API; read_views - модуль с реализацией читающих endpoints (views или async_views).
+    """
+    return [
+        path(r'api/ping', read_views.ping, name='ping'),
+        path(r'api/health', read_views.ping, name='health'),
+        path(r'api/ready', views.ready, name='ready'),
+        path(r'api/cache/stats', views.cache_stats, name='cache-stats'),
+        path(r'api/db/pool', views.db_pool_stats, name='db-pool-stats'),
+        path(r'metrics', views.metrics, name='metrics'),
+
+        path(r'api/tenders', read_views.get_tenders, name='tenders-list'),
+        path(r'api/tenders/my', read_views.get_user_tenders, name='my-tenders'),
+        path(r'api/tenders/new', views.create_tender, name='create-tender'),
+        path(r'api/tenders/bulk', views.create_tenders_bulk, name='create-tenders-bulk'),
+        path(r'api/tenders/export', views.export_tenders, name='export-tenders'),
+        path(r'api/tenders/<int:tender_id>/status', views.tender_status, name='upd-tender-status'),
+        path(r'api/tenders/<int:tender_id>/edit', views.edit_tender, name='edit-tender'),
+        path(r'api/tenders/<int:tender_id>/rollback/<int:version>/', views.rollback_tender_version, name='rollback-tender'),
+
+        path(r'api/bids/<int:tender_id>/list', read_views.get_bids_for_tender, name='bids-list'),
+        path(r'api/bids/<int:tender_id>/stats', views.get_bid_stats, name='bids-stats'),
+        path(r'api/bids/my', read_views.get_user_bids, name='my-bids'),
+        path(r'api/bids/new', views.create_bid, name='create-bid'),
+        path(r'api/bids/bulk', views.create_bids_bulk, name='create-bids-bulk'),
+        path(r'api/bids/export', views.export_bids, name='export-bids'),
+        path(r'api/bids/<int:bid_id>/status', views.bid_status, name='upd-bid-status'),
+        path(r'api/bids/<int:bid_id>/edit', views.edit_bid, name='edit-bid'),
+        path(r'api/bids/submit_decision', views.submit_decision, name='submit-decision'),
+        path(r'api/bids/<int:bid_id>/rollback/<int:version>/', views.rollback_bid_version, name='rollback-bid'),
+
+        path(r'api/bids/<int:tender_id>/reviews', read_views.get_reviews, name='get-reviews'),
+        path(r'api/bids/<int:bid_id>/feedback', views.create_review, name='leave-feedback'),
+
+        path(r'api/changes', read_views.get_changes, name='changes'),
+    ]
+
+
 schema_view = get_schema_view(
    openapi.Info(
       title="Tenders API",
@@ -17,29 +57,11 @@ schema_view = get_schema_view(
    ),
    public=True,
    permission_classes=(permissions.AllowAny,),
+   # drf-yasg описывает только DRF views: схема строится по синхронным версиям с тем же контрактом
+   patterns=api_urlpatterns(views),
 )
 
 urlpatterns = [
 
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-
-    path(r'api/ping', views.ping, name='ping'),
-
-    path(r'api/tenders', views.get_tenders, name='tenders-list'),
-    path(r'api/tenders/my', views.get_user_tenders, name='my-tenders'),
-    path(r'api/tenders/new', views.create_tender, name='create-tender'),
-    path(r'api/tenders/<int:tender_id>/status', views.tender_status, name='upd-tender-status'),
-    path(r'api/tenders/<int:tender_id>/edit', views.edit_tender, name='edit-tender'),
-    path(r'api/tenders/<int:tender_id>/rollback/<int:version>/', views.rollback_tender_version, name='rollback-tender'),
-
-    path(r'api/bids/<int:tender_id>/list', views.get_bids_for_tender, name='bids-list'),
-    path(r'api/bids/my', views.get_user_bids, name='my-bids'),
-    path(r'api/bids/new', views.create_bid, name='create-bid'),
-    path(r'api/bids/<int:bid_id>/status', views.bid_status, name='upd-bid-status'),
-    path(r'api/bids/<int:bid_id>/edit', views.edit_bid, name='edit-bid'),
-    path(r'api/bids/submit_decision', views.submit_decision, name='submit-decision'),
-    path(r'api/bids/<int:bid_id>/rollback/<int:version>/', views.rollback_bid_version, name='rollback-bid'),
-
-    path(r'api/bids/<int:tender_id>/reviews', views.get_reviews, name='get-reviews'),
-    path(r'api/bids/<int:bid_id>/feedback', views.create_review, name='leave-feedback'),
-]
\ No newline at end of file
+] + api_urlpatterns(async_views if settings.ASYNC_VIEWS else views)